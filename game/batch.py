@@ -0,0 +1,302 @@
+import os
+
+import numpy as np
+
+os.environ.setdefault('FROGGER_HEADLESS', '1')
+
+from game import frogger  # noqa: E402
+from game.rng import Stream, StreamArray, randomSeed  # noqa: E402
+
+UP, DOWN, LEFT, RIGHT = 1, 2, 3, 4
+
+WAYS = {"right": 1, "left": -1}
+
+# (x, y, direction, factor, sprite, interval) from frogger.CAR_LANES
+CAR_LANES = tuple((x, y, WAYS[way], factor, sprite, interval)
+                  for x, y, first, interval, sprite, way, factor
+                  in frogger.CAR_LANES)
+# (x, y, direction, interval) from frogger.LOG_LANES
+LOG_LANES = tuple((x, y, WAYS[way], interval)
+                  for x, y, first, interval, sprite, way
+                  in frogger.LOG_LANES)
+FIRST_CARS = tuple(lane[2] for lane in frogger.CAR_LANES)
+FIRST_LOGS = tuple(lane[2] for lane in frogger.LOG_LANES)
+# (left, right, slot x) as in frogArrived
+HOMES = ((33, 53, 43), (115, 135, 125), (197, 217, 207), (279, 299, 289),
+         (361, 381, 371))
+
+LOG_WIDTH = frogger.sprite_plataform.get_width()
+LOG_HEIGHT = frogger.sprite_plataform.get_height()
+
+
+class BatchFrogger():
+
+    def __init__(self, n=1024, seed=None, capacity=16):
+        self.n = n
+        self.seed = randomSeed() if seed is None else seed
+        self.rows = np.arange(n)
+        # game i draws like SessionRandom(seeds[i]); every new game takes
+        # the next seed of the episodes stream
+        self.seeder = Stream(self.seed, "episodes")
+        self.seeds = np.zeros(n, np.uint64)
+        self.lanes = StreamArray(self.seeds, "lanes")
+        self.events = StreamArray(self.seeds, "events")
+
+        def ints(value=0):
+            return np.full(n, value, np.int64)
+
+        self.speed = ints()
+        self.level = ints()
+        self.points = ints()
+        self.time = ints()
+        self.lives = ints()
+        self.ticks_time = ints()
+        self.tick = ints()
+        self.arrived = ints()
+        self.homes = np.zeros((n, len(HOMES)), bool)
+        self.ticks_enemys = np.zeros((n, len(CAR_LANES)))
+        self.ticks_plataforms = np.zeros((n, len(LOG_LANES)))
+
+        self.frog_x = ints()
+        self.frog_y = ints()
+        self.animation_counter = ints()
+        self.animation_tick = ints()
+        self.can_move = ints()
+        self.key_pressed = ints()
+
+        self.car = self.entityArrays(capacity)
+        self.log = self.entityArrays(capacity)
+        self.reset()
+
+    def entityArrays(self, capacity):
+        shape = (self.n, capacity)
+        return {
+            "x": np.zeros(shape, np.int64),
+            "y": np.zeros(shape, np.int64),
+            "width": np.ones(shape, np.int64),
+            "height": np.ones(shape, np.int64),
+            "velocity": np.zeros(shape, np.int64),
+            "order": np.zeros(shape, np.int64),
+            "alive": np.zeros(shape, bool),
+        }
+
+    def reset(self, mask=None):
+        if mask is None:
+            mask = np.ones(self.n, bool)
+        rows = np.flatnonzero(mask)
+        seeds = np.array([self.seeder.next() for _ in rows], np.uint64)
+        self.seeds[rows] = seeds
+        self.lanes.reseed(rows, seeds)
+        self.events.reseed(rows, seeds)
+        self.speed[mask] = 3
+        self.level[mask] = 1
+        self.points[mask] = 0
+        self.lives[mask] = 3
+        self.tick[mask] = 0
+        self.arrived[mask] = 0
+        self.homes[mask] = False
+        self.ticks_time[mask] = 30
+        self.ticks_enemys[mask] = FIRST_CARS
+        self.ticks_plataforms[mask] = FIRST_LOGS
+        self.key_pressed[mask] = 0
+        self.car["alive"][mask] = False
+        self.log["alive"][mask] = False
+        self.resetFrog(mask)
+        self.time[mask] = 30
+        return self.observe()
+
+    def resetFrog(self, mask):
+        self.frog_x[mask] = 207
+        self.frog_y[mask] = 475
+        self.animation_counter[mask] = 0
+        self.animation_tick[mask] = 1
+        self.can_move[mask] = 1
+
+    def frogDead(self, mask):
+        self.resetFrog(mask)
+        self.lives[mask] -= 1
+        self.time[mask] = 30
+
+    def step(self, actions):
+        actions = np.broadcast_to(np.asarray(actions, np.int64), (self.n,))
+        points = self.points.copy()
+
+        press = (actions > 0) & (self.can_move == 1)
+        self.key_pressed[press] = actions[press]
+        self.moveFrog(press)
+        self.can_move[press] = 0
+
+        self.countdown()
+        self.spawn()
+        self.car["x"] += self.car["velocity"] * self.speed[:, None]
+        self.log["x"] += self.log["velocity"] * self.speed[:, None]
+        self.whereIsTheFrog()
+        self.nextLevel()
+        self.changeRoad()
+        self.animateFrog()
+        self.despawn()
+        self.tick += 1
+
+        rewards = self.points - points
+        lives = self.lives.copy()
+        done = lives <= 0
+        if done.any():
+            self.reset(done)
+        return self.observe(), rewards, lives, done
+
+    def observe(self):
+        # the frog and the game, then which homes are taken
+        state = np.stack((self.frog_x, self.frog_y, self.animation_counter,
+                          self.can_move, self.time, self.lives, self.level,
+                          self.speed, self.arrived), axis=1)
+        return np.concatenate((state, self.homes), axis=1).astype(np.float32)
+
+    def moveFrog(self, mask):
+        self.animation_counter[mask] += 1
+        wrapped = mask & (self.animation_counter == 3)
+        self.animation_counter[wrapped] = 0
+        self.can_move[wrapped] = 1
+
+        key = self.key_pressed
+        x = self.frog_x
+        y = self.frog_y
+        step = np.where(self.animation_counter == 2, 13, 14)
+        y[mask & (key == UP) & (y > 39)] -= 13
+        y[mask & (key == DOWN) & (y < 473)] += 13
+        left = mask & (key == LEFT) & (x > 2)
+        x[left] -= step[left]
+        right = mask & (key == RIGHT) & (x < 401)
+        x[right] += step[right]
+
+    def animateFrog(self):
+        active = self.animation_counter != 0
+        fire = active & (self.animation_tick <= 0)
+        self.animation_tick[active & ~fire] -= 1
+        self.moveFrog(fire)
+        self.animation_tick[fire] = 1
+
+    def countdown(self):
+        second = self.ticks_time == 0
+        self.ticks_time[second] = 30
+        self.time[second] -= 1
+        self.ticks_time[~second] -= 1
+        self.frogDead(self.time == 0)
+
+    def spawn(self):
+        for i, (x, y, way, factor, sprite, interval) in enumerate(CAR_LANES):
+            rows = self.due(self.ticks_enemys, i, interval)
+            if len(rows):
+                self.add("car", rows, i, x, y, sprite.get_width(),
+                         sprite.get_height(), way * factor)
+        for i, (x, y, way, interval) in enumerate(LOG_LANES):
+            rows = self.due(self.ticks_plataforms, i, interval)
+            if len(rows):
+                self.add("log", rows, i, x, y, LOG_WIDTH, LOG_HEIGHT, way)
+
+    def due(self, ticks, lane, interval):
+        column = ticks[:, lane]
+        rows = np.flatnonzero(column <= 0)
+        column -= 1
+        column[rows] = (interval * self.speed[rows]) / self.level[rows]
+        return rows
+
+    def add(self, kind, rows, lane, x, y, width, height, velocity):
+        entities = getattr(self, kind)
+        free = ~entities["alive"][rows]
+        if not free.any(axis=1).all():
+            entities = self.grow(kind)
+            free = ~entities["alive"][rows]
+        slots = free.argmax(axis=1)
+        entities["x"][rows, slots] = x
+        entities["y"][rows, slots] = y
+        entities["width"][rows, slots] = width
+        entities["height"][rows, slots] = height
+        entities["velocity"][rows, slots] = velocity
+        entities["order"][rows, slots] = self.tick[rows] * 8 + lane
+        entities["alive"][rows, slots] = True
+
+    def grow(self, kind):
+        entities = getattr(self, kind)
+        bigger = self.entityArrays(entities["x"].shape[1] * 2)
+        for name, array in entities.items():
+            bigger[name][:, :array.shape[1]] = array
+        setattr(self, kind, bigger)
+        return bigger
+
+    def overlaps(self, entities):
+        x = self.frog_x[:, None]
+        y = self.frog_y[:, None]
+        return (entities["alive"] & (entities["x"] < x + 30) &
+                (entities["x"] + entities["width"] > x) &
+                (entities["y"] < y + 30) &
+                (entities["y"] + entities["height"] > y))
+
+    def whereIsTheFrog(self):
+        y = self.frog_y
+        street = y > 240
+        lake = (y < 240) & (y > 40)
+        goal = y < 40
+
+        dead = street & self.overlaps(self.car).any(axis=1)
+
+        hits = self.overlaps(self.log)
+        on_log = hits.any(axis=1)
+        dead |= lake & ~on_log
+        # a frog touching two logs rides the one spawned last
+        last = np.where(hits, self.log["order"], -1).argmax(axis=1)
+        way = self.log["velocity"][self.rows, last]
+        ride = lake & on_log
+        self.frog_x[ride] += way[ride] * self.speed[ride]
+        self.frogDead(dead)
+
+        arrived = np.zeros(self.n, bool)
+        for slot, (left, right, _) in enumerate(HOMES):
+            home = goal & (self.frog_x > left) & (self.frog_x < right)
+            self.homes[home, slot] = True
+            arrived |= home
+        self.points[arrived] += 10 + self.time[arrived]
+        self.time[arrived] = 30
+        self.arrived[arrived] += 1
+        self.resetFrog(arrived)
+
+        missed = goal & ~arrived
+        self.frog_y[missed] = 46
+        self.animation_counter[missed] = 0
+        self.animation_tick[missed] = 1
+        self.can_move[missed] = 1
+
+    def nextLevel(self):
+        done = self.arrived == 5
+        self.arrived[done] = 0
+        self.homes[done] = False
+        self.frog_x[done] = 207
+        self.frog_y[done] = 475
+        self.level[done] += 1
+        self.speed[done] += 1
+        self.points[done] += 100
+        self.time[done] = 30
+
+    def changeRoad(self):
+        # the same draws as Session.changeRoad and carChangeRoad
+        cars = self.car
+        alive = cars["alive"]
+        draw = self.events.randint(0, 100, self.rows)
+        rows = np.flatnonzero((draw % 100 == 0) & alive.any(axis=1))
+        if not len(rows):
+            return
+        # carChangeRoad picks by position in the spawn-ordered list
+        order = np.where(alive[rows], cars["order"][rows],
+                         np.iinfo(np.int64).max)
+        ranked = np.argsort(order, axis=1, kind="stable")
+        index = self.lanes.below(alive[rows].sum(axis=1), rows)
+        slots = ranked[np.arange(len(rows)), index]
+        choice = self.lanes.randint(1, 2, rows)
+        y = cars["y"][rows, slots] + np.where(choice % 2 == 0, 39, -39)
+        keep = (y >= 280) & (y <= 436)
+        cars["y"][rows[keep], slots[keep]] = y[keep]
+
+    def despawn(self):
+        for table, (left, right) in ((self.car, frogger.CAR_BOUNDS),
+                                     (self.log, frogger.LOG_BOUNDS)):
+            x = table["x"]
+            table["alive"] &= (x >= left) & (x <= right)
@@ -0,0 +1,239 @@
+import argparse
+import json
+import os
+import platform
+import random as Random
+import statistics
+import sys
+import time
+
+# the dummy driver lets the drawing benchmarks run on machines without a
+# screen; the game itself is imported with its display, not headless
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame  # noqa: E402
+
+from game import frogger  # noqa: E402
+
+COUNTS = (10, 100, 1000, 10000, 100000)
+CAR_LANES = (
+    (436, frogger.sprite_car1, "right", 1),
+    (397, frogger.sprite_car2, "left", 2),
+    (357, frogger.sprite_car3, "right", 2),
+    (318, frogger.sprite_car4, "left", 1),
+    (280, frogger.sprite_car5, "right", 1),
+)
+LOG_LANES = ((200, "right"), (161, "left"), (122, "right"), (83, "left"),
+             (44, "right"))
+
+
+def makeEnemys(count, rng):
+    # spread over the lanes and the visible road, clear of the frog's start
+    return [frogger.Enemy([rng.randint(-50, 500), y], sprite, way, factor)
+            for y, sprite, way, factor in
+            (CAR_LANES[i % len(CAR_LANES)] for i in range(count))]
+
+
+def makePlataforms(count, rng):
+    return [frogger.Plataform([rng.randint(-90, 440), y],
+                              frogger.sprite_plataform, way)
+            for y, way in (LOG_LANES[i % len(LOG_LANES)]
+                           for i in range(count))]
+
+
+def restore(entities, positions):
+    for entity, (x, y) in zip(entities, positions):
+        entity.position[0] = x
+        entity.position[1] = y
+
+
+class Case():
+    # setup() runs untimed before every call of run()
+
+    def __init__(self, name, count, run, setup=None):
+        self.name = name
+        self.count = count
+        self.run = run
+        self.setup = setup
+
+
+def cases(count, seed=0):
+    rng = Random.Random(seed)
+    game = frogger.Game(3, 1)
+    enemys = makeEnemys(count, rng)
+    plataforms = makePlataforms(count, rng)
+    car_positions = [tuple(e.position) for e in enemys]
+    log_positions = [tuple(p.position) for p in plataforms]
+
+    def resetCars():
+        restore(enemys, car_positions)
+
+    def resetLogs():
+        restore(plataforms, log_positions)
+
+    spawned = []
+
+    def spawnTicks():
+        del enemys[count:]
+        del plataforms[count:]
+        spawned[:] = [0, 0, 0, 0, 0]
+
+    # a tenth of the cars sit past the edges, so destroyEnemys removes some
+    leaving = makeEnemys(count, rng)
+    for enemy in leaving[::10]:
+        enemy.position[0] = 600
+    leaving_positions = [tuple(e.position) for e in leaving]
+    destroy = []
+
+    def resetDestroy():
+        restore(leaving, leaving_positions)
+        destroy[:] = leaving
+
+    street_frog = frogger.Frog([207, 475], frogger.sprite_sapo)
+    lake_frog = frogger.Frog([207, 200], frogger.sprite_sapo)
+    if plataforms:
+        # the frog rides the first log instead of drowning
+        plataforms[0].position[0] = 207
+        log_positions[0] = tuple(plataforms[0].position)
+
+    def resetLakeFrog():
+        lake_frog.position[:] = [207, 200]
+        lake_frog.lives = 3
+
+    session = frogger.Session(frogger.Game(3, 1), enemys, plataforms,
+                              seed=seed)
+
+    def resetSession():
+        spawnTicks()
+        resetCars()
+        resetLogs()
+        session.newFrog()
+        session.frog.lives = 3
+
+    def fullTick():
+        session.update()
+        session.draw()
+
+    return [
+        Case("createEnemys", count,
+             lambda: frogger.createEnemys(spawned, enemys, game), spawnTicks),
+        Case("createPlataform", count,
+             lambda: frogger.createPlataform(spawned, plataforms, game),
+             spawnTicks),
+        Case("moveList", count,
+             lambda: frogger.moveList(enemys, game.speed), resetCars),
+        Case("destroyEnemys", count,
+             lambda: frogger.destroyEnemys(destroy), resetDestroy),
+        Case("frogOnTheStreet", count,
+             lambda: frogger.frogOnTheStreet(street_frog, enemys, game),
+             resetCars),
+        Case("frogInTheLake", count,
+             lambda: frogger.frogInTheLake(lake_frog, plataforms, game),
+             resetLakeFrog),
+        Case("drawList", count, lambda: frogger.drawList(enemys)),
+        Case("tick", count, fullTick, resetSession),
+    ]
+
+
+def measure(case, budget=0.2, min_repeat=3, max_repeat=1000):
+    samples = []
+    spent = 0.0
+    while len(samples) < min_repeat or (spent < budget and
+                                        len(samples) < max_repeat):
+        if case.setup:
+            case.setup()
+        start = time.perf_counter()
+        case.run()
+        elapsed = time.perf_counter() - start
+        samples.append(elapsed)
+        spent += elapsed
+    return {
+        "name": case.name,
+        "count": case.count,
+        "repeat": len(samples),
+        "median_us": round(statistics.median(samples) * 1e6, 3),
+        "min_us": round(min(samples) * 1e6, 3),
+    }
+
+
+def run(counts=COUNTS, names=None, budget=0.2, seed=0):
+    results = []
+    for count in counts:
+        for case in cases(count, seed):
+            if names and case.name not in names:
+                continue
+            results.append(measure(case, budget))
+    return {
+        "machine": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "video_driver": os.environ.get('SDL_VIDEODRIVER'),
+        },
+        "results": results,
+    }
+
+
+def compare(results, baseline, threshold=1.25):
+    # a case regresses when its median is `threshold` times the baseline's
+    old = {(r["name"], r["count"]): r for r in baseline["results"]}
+    rows = []
+    for result in results["results"]:
+        before = old.get((result["name"], result["count"]))
+        if before is None or not before["median_us"]:
+            continue
+        ratio = result["median_us"] / before["median_us"]
+        rows.append({
+            "name": result["name"],
+            "count": result["count"],
+            "baseline_us": before["median_us"],
+            "median_us": result["median_us"],
+            "ratio": round(ratio, 3),
+            "regression": ratio > threshold,
+        })
+    return rows
+
+
+def table(rows, columns):
+    lines = ['  '.join('{0:>15}'.format(c) for c in columns)]
+    for row in rows:
+        lines.append('  '.join('{0:>15}'.format(str(row[c]))
+                               for c in columns))
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m game.bench')
+    parser.add_argument('--counts', type=int, nargs='+', default=COUNTS)
+    parser.add_argument('--only', nargs='+',
+                        help='benchmark names to run (default: all)')
+    parser.add_argument('--budget', type=float, default=0.2,
+                        help='seconds of timed calls per benchmark')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write the results as JSON')
+    parser.add_argument('--baseline', help='JSON results to compare against')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='median ratio that counts as a regression')
+    args = parser.parse_args(argv)
+
+    results = run(args.counts, args.only, args.budget, args.seed)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(json.dumps(results, indent=2) + '\n')
+    print(table(results["results"],
+                ("name", "count", "repeat", "median_us", "min_us")))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            rows = compare(results, json.load(f), args.threshold)
+        print()
+        print(table(rows, ("name", "count", "baseline_us", "median_us",
+                           "ratio", "regression")))
+        if any(row["regression"] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
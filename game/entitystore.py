@@ -0,0 +1,162 @@
+import random as Random
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from game import frogger
+
+WAYS = {"right": 1, "left": -1}
+WAY_NAMES = {1: "right", -1: "left", 0: ""}
+
+
+# Cars or logs as parallel arrays; append() lets createEnemys and
+# createPlataform spawn into it unchanged. The entity itself is not kept,
+# so with a pool it goes straight back for the next spawn.
+class EntityStore():
+
+    FIELDS = ("x", "y", "width", "height", "direction", "factor")
+
+    def __init__(self, capacity=64, pool=None):
+        if np is None:
+            raise ImportError("EntityStore requires numpy")
+        self.pool = pool
+        self.count = 0
+        for field in self.FIELDS:
+            setattr(self, field, np.zeros(capacity))
+        self.sprites = []
+
+    def __len__(self):
+        return self.count
+
+    def grow(self):
+        for field in self.FIELDS:
+            array = getattr(self, field)
+            bigger = np.zeros(len(array) * 2)
+            bigger[:self.count] = array[:self.count]
+            setattr(self, field, bigger)
+
+    def append(self, entity):
+        if self.count == len(self.x):
+            self.grow()
+        i = self.count
+        self.x[i] = entity.position[0]
+        self.y[i] = entity.position[1]
+        self.width[i] = entity.sprite.get_width()
+        self.height[i] = entity.sprite.get_height()
+        self.direction[i] = WAYS.get(entity.way, 0)
+        self.factor[i] = getattr(entity, "factor", 1)
+        self.sprites.append(entity.sprite)
+        self.count = i + 1
+        if self.pool is not None:
+            self.pool.release(entity)
+
+    def move(self, speed):
+        n = self.count
+        self.x[:n] += self.direction[:n] * self.factor[:n] * speed
+
+    def despawn(self, left, right):
+        n = self.count
+        x = self.x[:n]
+        keep = np.flatnonzero((x >= left) & (x <= right))
+        removed = n - len(keep)
+        if removed:
+            for field in self.FIELDS:
+                array = getattr(self, field)
+                array[:len(keep)] = array[keep]
+            self.sprites = [self.sprites[i] for i in keep]
+            self.count = len(keep)
+        return removed
+
+    def overlaps(self, rect):
+        # same rule as Rect.colliderect
+        n = self.count
+        x = self.x[:n]
+        y = self.y[:n]
+        hit = ((x < rect.right) & (x + self.width[:n] > rect.left) &
+               (y < rect.bottom) & (y + self.height[:n] > rect.top))
+        return np.flatnonzero(hit)
+
+    def changeRoad(self, rng=Random):
+        i = rng.choice(range(self.count))
+        choice = rng.randint(1, 2)
+        if (choice % 2 == 0):
+            y = self.y[i] + 39
+        else:
+            y = self.y[i] - 39
+        if 280 <= y <= 436:
+            self.y[i] = y
+
+    def way(self, i):
+        return WAY_NAMES[int(self.direction[i])]
+
+    def state(self):
+        n = self.count
+        return [(x, y, WAY_NAMES[int(d)]) for x, y, d in zip(
+            self.x[:n].tolist(), self.y[:n].tolist(),
+            self.direction[:n].tolist())]
+
+    def drawItems(self):
+        return [((id(self), i), sprite, (x, y), None)
+                for i, (sprite, x, y) in enumerate(zip(
+                    self.sprites, self.x[:self.count].tolist(),
+                    self.y[:self.count].tolist()))]
+
+
+def frogOnTheStreet(frog, enemys, game):
+    if len(enemys.overlaps(frog.rect())):
+        frogger.hit_sound.play()
+        frog.frogDead(game)
+
+
+def frogInTheLake(frog, plataforms, game):
+    hits = plataforms.overlaps(frog.rect())
+    if not len(hits):
+        frogger.agua_sound.play()
+        frog.frogDead(game)
+    else:
+        wayPlataform = plataforms.way(hits[-1])
+        if wayPlataform == "right":
+            frog.position[0] = frog.position[0] + game.speed
+        elif wayPlataform == "left":
+            frog.position[0] = frog.position[0] - game.speed
+
+
+def whereIsTheFrog(frog, enemys, plataforms, chegaram, game, pool=None):
+    if frog.position[1] > 240:
+        frogOnTheStreet(frog, enemys, game)
+    elif frog.position[1] < 240 and frog.position[1] > 40:
+        frogInTheLake(frog, plataforms, game)
+    elif frog.position[1] < 40:
+        frogger.frogArrived(frog, chegaram, game, pool)
+
+
+class StoreSession(frogger.Session):
+
+    def __init__(self, game=None, rng=None, seed=None):
+        frogger.Session.__init__(self, game, EntityStore(), EntityStore(),
+                                 None, rng, seed)
+        self.enemys.pool = self.car_pool
+        self.plataforms.pool = self.log_pool
+
+    def move(self):
+        self.enemys.move(self.game.speed)
+        self.plataforms.move(self.game.speed)
+
+    def checkFrog(self):
+        whereIsTheFrog(self.frog, self.enemys, self.plataforms,
+                       self.chegaram, self.game, self.arrived_pool)
+
+    def changeRoad(self):
+        random = self.events.randint(0, 100)
+        if (random % 100 == 0):
+            self.enemys.changeRoad(self.lanes)
+
+    def cleanup(self):
+        self.enemys.despawn(*frogger.CAR_BOUNDS)
+        self.plataforms.despawn(*frogger.LOG_BOUNDS)
+
+    def entityItems(self):
+        return (self.enemys.drawItems() + self.plataforms.drawItems() +
+                [i.drawItem() for i in self.chegaram])
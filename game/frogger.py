@@ -1,24 +1,123 @@
 #! /usr/bin/env python
+import os
+import string
+import sys
+import threading
+import time
 import pygame
 import random as Random
 from pygame.locals import *
 from sys import exit
 
-pygame.init()
-pygame.font.init()
-pygame.mixer.pre_init(44100, 32, 2, 4096)
-screen = pygame.display.set_mode((448, 546), 0, 32)
-pygame.display.set_caption('Frogger')
-
-font_name = pygame.font.get_default_font()
-game_font = pygame.font.SysFont(font_name, 72)
-info_font = pygame.font.SysFont(font_name, 24)
-menu_font = pygame.font.SysFont(font_name, 36)
-
-hit_sound = pygame.mixer.Sound('./sounds/boom.wav')
-agua_sound = pygame.mixer.Sound('./sounds/agua.wav')
-chegou_sound = pygame.mixer.Sound('./sounds/success.wav')
-trilha_sound = pygame.mixer.Sound('./sounds/guimo.wav')
+if not __package__:
+    # rodando como script (python game/frogger.py): deixa o pacote game
+    # importavel para os modulos carregados sob demanda
+    sys.path.insert(0, os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))))
+
+from game.hazards import HazardTable, laneSpecs  # noqa: E402
+from game.kinematics import fastForward  # noqa: E402
+from game.pool import Pool, spawn  # noqa: E402
+from game.rng import SessionRandom, Stream  # noqa: E402
+from game.spawner import SpawnScheduler, laneInterval  # noqa: E402
+
+STARTED = time.perf_counter()
+startup = {}
+
+# FROGGER_HEADLESS=1 pula display, fontes e mixer (simulacao sem janela)
+if __name__ == '__main__' and sys.argv[1:2] in (['rollout'], ['replay'],
+                                                ['policy']):
+    os.environ['FROGGER_HEADLESS'] = '1'
+HEADLESS = os.environ.get('FROGGER_HEADLESS') == '1'
+
+
+class SilentSound():
+
+    def play(self, loops=0):
+        pass
+
+
+def loadImage(filename, alpha=True):
+    image = pygame.image.load(filename)
+    if pygame.display.get_surface() is None:
+        return image
+    if alpha:
+        return image.convert_alpha()
+    return image.convert()
+
+
+class SoundLoader():
+    # Abre o mixer e decodifica os WAVs fora da thread principal; ate um
+    # som ficar pronto ele toca em silencio. So troca o SILENT: um som que
+    # alguem ja trocou (None, um mock) fica como esta.
+
+    def __init__(self, files):
+        self.files = files
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        start = time.perf_counter()
+        try:
+            pygame.mixer.init()
+        except pygame.error:
+            self.files = ()
+        for name, filename in self.files:
+            try:
+                sound = pygame.mixer.Sound(filename)
+            except (pygame.error, OSError):
+                continue
+            if globals()[name] is SILENT:
+                globals()[name] = sound
+        startup["audio"] = time.perf_counter() - start
+
+    def ready(self):
+        return not self.thread.is_alive()
+
+    def wait(self, timeout=None):
+        self.thread.join(timeout)
+        return self.ready()
+
+
+SILENT = SilentSound()
+hit_sound = agua_sound = chegou_sound = trilha_sound = SILENT
+sound_loader = None
+
+
+def startMusic(started, report=False):
+    # a trilha comeca no primeiro frame em que o SoundLoader ja terminou,
+    # sem segurar o menu esperando o mixer
+    if started or (sound_loader and not sound_loader.ready()):
+        return started
+    if trilha_sound:
+        trilha_sound.play(-1)
+    if report:
+        print(startupReport())
+    return True
+
+if not HEADLESS:
+    pygame.mixer.pre_init(44100, 32, 2, 4096)
+    # so o que o primeiro frame precisa; o mixer sobe no SoundLoader
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((448, 546), 0, 32)
+    pygame.display.set_caption('Frogger')
+
+    # SysFont(get_default_font()) varria as fontes do sistema so para cair
+    # na freesansbold que ja vem com o pygame, que e o que Font(None) abre
+    game_font = pygame.font.Font(None, 72)
+    info_font = pygame.font.Font(None, 24)
+    menu_font = pygame.font.Font(None, 36)
+
+    sound_loader = SoundLoader((
+        ('hit_sound', './sounds/boom.wav'),
+        ('agua_sound', './sounds/agua.wav'),
+        ('chegou_sound', './sounds/success.wav'),
+        ('trilha_sound', './sounds/guimo.wav'),
+    ))
+else:
+    screen = None
+    game_font = info_font = menu_font = None
 
 enemys = []
 plataforms = []
@@ -34,38 +133,144 @@ car4_filename = './images/car4.png'
 car5_filename = './images/car5.png'
 plataform_filename = './images/tronco.png'
 
-background = pygame.image.load(background_filename).convert()
-sprite_sapo = pygame.image.load(frog_filename).convert_alpha()
-sprite_arrived = pygame.image.load(arrived_filename).convert_alpha()
-sprite_car1 = pygame.image.load(car1_filename).convert_alpha()
-sprite_car2 = pygame.image.load(car2_filename).convert_alpha()
-sprite_car3 = pygame.image.load(car3_filename).convert_alpha()
-sprite_car4 = pygame.image.load(car4_filename).convert_alpha()
-sprite_car5 = pygame.image.load(car5_filename).convert_alpha()
-sprite_plataform = pygame.image.load(plataform_filename).convert_alpha()
+
+class SpriteManager():
+
+    def __init__(self, pattern='./images/sprite_sheets_{0}.png', frames=3):
+        self.sheets = {}
+        self.frames = {}
+        self.by_sheet = {}
+        for way in ("up", "down", "left", "right"):
+            sheet = loadImage(pattern.format(way))
+            area = sheet.get_rect()
+            # mesmo recorte que o Frog.draw fazia a cada frame
+            self.sheets[way] = sheet
+            self.frames[way] = [
+                sheet.subsurface(Rect(i * 30, 0, 30, 30 + i * 30).clip(area))
+                for i in range(frames)]
+            self.by_sheet[id(sheet)] = self.frames[way]
+
+    def framesFor(self, sheet):
+        return self.by_sheet.get(id(sheet))
+
+
+# Linhas do HUD so sao refeitas quando os valores mudam, e os numeros sao
+# montados com os digitos renderizados uma vez so.
+class Hud():
+
+    formatter = string.Formatter()
+
+    def __init__(self, font, color=(255, 255, 255)):
+        self.font = font
+        self.color = color
+        self.glyphs = {c: font.render(c, 1, color) for c in '-0123456789'}
+        self.labels = {}
+        self.lines = {}
+        self.renders = 0
+
+    def line(self, template, values):
+        cached = self.lines.get(template)
+        if cached is not None and cached[0] == values:
+            return cached[1]
+        surface = self.compose(template, values)
+        self.lines[template] = (values, surface)
+        return surface
+
+    def label(self, text):
+        surface = self.labels.get(text)
+        if surface is None:
+            surface = self.labels[text] = self.text(text)
+        return surface
+
+    def text(self, text):
+        self.renders += 1
+        return self.font.render(text, 1, self.color)
+
+    def number(self, value):
+        text = str(value)
+        if isinstance(value, int) and not isinstance(value, bool):
+            return [self.glyphs[c] for c in text]
+        return [self.text(text)]
+
+    def compose(self, template, values):
+        pieces = []
+        for literal, field, spec, conversion in self.formatter.parse(template):
+            if literal:
+                pieces.append(self.label(literal))
+            if field is not None:
+                pieces.extend(self.number(values[int(field)]))
+        width = sum(piece.get_width() for piece in pieces)
+        height = max([self.font.get_height()] +
+                     [piece.get_height() for piece in pieces])
+        surface = pygame.Surface((width, height), SRCALPHA)
+        x = 0
+        for piece in pieces:
+            # MAX copia os pixels com alpha sem misturar com o fundo vazio
+            surface.blit(piece, (x, 0), special_flags=BLEND_RGBA_MAX)
+            x += piece.get_width()
+        return surface
+
+
+background = loadImage(background_filename, False)
+frog_sprites = SpriteManager()
+sprite_sapo = frog_sprites.sheets["up"]
+sprite_arrived = loadImage(arrived_filename)
+sprite_car1 = loadImage(car1_filename)
+sprite_car2 = loadImage(car2_filename)
+sprite_car3 = loadImage(car3_filename)
+sprite_car4 = loadImage(car4_filename)
+sprite_car5 = loadImage(car5_filename)
+sprite_plataform = loadImage(plataform_filename)
+hud = Hud(info_font) if info_font is not None else None
 
 # --- Carregando Efeitos Sonoros ---
 
 
+# __slots__ em todas as entidades: sem __dict__ por instancia, o que pesa
+# com milhares de sessoes no mesmo processo. box e o Rect da entidade,
+# criado uma vez com o tamanho do sprite e so reposicionado por rect().
 class Object():
 
+    __slots__ = ("sprite", "position", "box")
+
     def __init__(self, position, sprite):
         self.sprite = sprite
         self.position = position
+        self.box = Rect(position[0], position[1], sprite.get_width(),
+                        sprite.get_height())
 
     def draw(self):
         screen.blit(self.sprite, (self.position))
 
+    def reset(self, x, y, sprite):
+        if sprite is not self.sprite:
+            self.sprite = sprite
+            self.box.size = sprite.get_size()
+        self.position[0] = x
+        self.position[1] = y
+
+    def drawItem(self):
+        return (id(self), self.sprite, self.position, None)
+
     def rect(self):
-        return Rect(self.position[0], self.position[1],
-                    self.sprite.get_width(), self.sprite.get_height())
+        # a posicao muda por fora de move() (troca de faixa, tronco levando
+        # o sapo), entao o Rect e acertado aqui
+        box = self.box
+        box.x = self.position[0]
+        box.y = self.position[1]
+        return box
 
 
 class Frog(Object):
 
+    __slots__ = ("frames", "lives", "animation_counter", "animation_tick",
+                 "way", "can_move")
+
     def __init__(self, position, sprite_sapo):
         self.sprite = sprite_sapo
+        self.frames = frog_sprites.framesFor(sprite_sapo)
         self.position = position
+        self.box = Rect(position[0], position[1], 30, 30)
         self.lives = 3
         self.animation_counter = 0
         self.animation_tick = 1
@@ -75,18 +280,9 @@ class Frog(Object):
     def updateSprite(self, key_pressed):
         if self.way != key_pressed:
             self.way = key_pressed
-            if self.way == "up":
-                frog_filename = './images/sprite_sheets_up.png'
-                self.sprite = pygame.image.load(frog_filename).convert_alpha()
-            elif self.way == "down":
-                frog_filename = './images/sprite_sheets_down.png'
-                self.sprite = pygame.image.load(frog_filename).convert_alpha()
-            elif self.way == "left":
-                frog_filename = './images/sprite_sheets_left.png'
-                self.sprite = pygame.image.load(frog_filename).convert_alpha()
-            elif self.way == "right":
-                frog_filename = './images/sprite_sheets_right.png'
-                self.sprite = pygame.image.load(frog_filename).convert_alpha()
+            if self.way in frog_sprites.sheets:
+                self.sprite = frog_sprites.sheets[self.way]
+                self.frames = frog_sprites.frames[self.way]
 
     def moveFrog(self, key_pressed, key_up):
         if self.animation_counter == 0:
@@ -148,19 +344,33 @@ class Frog(Object):
         self.position = [207, 475]
 
     def draw(self):
+        if self.frames is not None:
+            screen.blit(self.frames[self.animation_counter], self.position)
+            return
         current_sprite = self.animation_counter * 30
         screen.blit(self.sprite, (self.position),
                     (0 + current_sprite, 0, 30, 30 + current_sprite))
 
-    def rect(self):
-        return Rect(self.position[0], self.position[1], 30, 30)
+    def drawItem(self):
+        if self.frames is not None:
+            return (id(self), self.frames[self.animation_counter],
+                    self.position, None)
+        current_sprite = self.animation_counter * 30
+        return (id(self), self.sprite, self.position,
+                Rect(current_sprite, 0, 30, 30 + current_sprite))
 
 
 class Enemy(Object):
 
+    __slots__ = ("way", "factor")
+
     def __init__(self, position, sprite_enemy, way, factor):
-        self.sprite = sprite_enemy
-        self.position = position
+        Object.__init__(self, position, sprite_enemy)
+        self.way = way
+        self.factor = factor
+
+    def reset(self, x, y, sprite_enemy, way, factor):
+        Object.reset(self, x, y, sprite_enemy)
         self.way = way
         self.factor = factor
 
@@ -173,9 +383,14 @@ class Enemy(Object):
 
 class Plataform(Object):
 
+    __slots__ = ("way",)
+
     def __init__(self, position, sprite_plataform, way):
-        self.sprite = sprite_plataform
-        self.position = position
+        Object.__init__(self, position, sprite_plataform)
+        self.way = way
+
+    def reset(self, x, y, sprite_plataform, way):
+        Object.reset(self, x, y, sprite_plataform)
         self.way = way
 
     def move(self, speed):
@@ -224,89 +439,73 @@ def moveList(list, speed):
         i.move(speed)
 
 
-def destroyEnemys(list):
+def destroyList(list, left, right, pool=None):
+    # compacta a lista no lugar; quem saiu da tela volta para o pool
+    kept = 0
     for i in list:
-        if i.position[0] < -80:
-            list.remove(i)
-        elif i.position[0] > 516:
-            list.remove(i)
+        if left <= i.position[0] <= right:
+            list[kept] = i
+            kept += 1
+        elif pool is not None:
+            pool.release(i)
+    del list[kept:]
+
+
+def destroyEnemys(list, pool=None):
+    destroyList(list, CAR_BOUNDS[0], CAR_BOUNDS[1], pool)
+
+
+def destroyPlataforms(list, pool=None):
+    destroyList(list, LOG_BOUNDS[0], LOG_BOUNDS[1], pool)
+
+
+# Faixas de carros e troncos: x e y de onde nascem, contador inicial,
+# intervalo base (ver laneInterval) e o resto dos argumentos da entidade
+CAR_LANES = (
+    (-55, 436, 30, 40, sprite_car1, "right", 1),
+    (506, 397, 0, 30, sprite_car2, "left", 2),
+    (-80, 357, 30, 40, sprite_car3, "right", 2),
+    (516, 318, 0, 30, sprite_car4, "left", 1),
+    (-56, 280, 60, 50, sprite_car5, "right", 1),
+)
+LOG_LANES = (
+    (-100, 200, 0, 30, sprite_plataform, "right"),
+    (448, 161, 0, 30, sprite_plataform, "left"),
+    (-100, 122, 30, 40, sprite_plataform, "right"),
+    (448, 83, 30, 40, sprite_plataform, "left"),
+    (-100, 44, 30, 20, sprite_plataform, "right"),
+)
+# ate onde carros e troncos andam antes de sumir
+CAR_BOUNDS = (-80, 516)
+LOG_BOUNDS = (-100, 448)
+# carChangeRoad nao leva carro abaixo de y 436, entao daqui para baixo o
+# sapo nunca e atropelado
+SAFE_ROW = 436 + max(lane[4].get_height() for lane in CAR_LANES)
+
+
+def createFromLanes(list, entities, game, lanes, cls, pool=None):
+    # list tem um contador por faixa, decrementado a cada tick
+    for i, tick in enumerate(list):
+        list[i] = tick - 1
+        if tick <= 0:
+            x, y, first, interval, *args = lanes[i]
+            list[i] = laneInterval(interval, game)
+            entities.append(spawn(pool, cls, x, y, *args))
 
 
-def destroyPlataforms(list):
-    for i in list:
-        if i.position[0] < -100:
-            list.remove(i)
-        elif i.position[0] > 448:
-            list.remove(i)
+def createEnemys(list, enemys, game, pool=None):
+    createFromLanes(list, enemys, game, CAR_LANES, Enemy, pool)
 
 
-def createEnemys(list, enemys, game):
-    for i, tick in enumerate(list):
-        list[i] = list[i] - 1
-        if tick <= 0:
-            if i == 0:
-                list[0] = (40 * game.speed) / game.level
-                position_init = [-55, 436]
-                enemy = Enemy(position_init, sprite_car1, "right", 1)
-                enemys.append(enemy)
-            elif i == 1:
-                list[1] = (30 * game.speed) / game.level
-                position_init = [506, 397]
-                enemy = Enemy(position_init, sprite_car2, "left", 2)
-                enemys.append(enemy)
-            elif i == 2:
-                list[2] = (40 * game.speed) / game.level
-                position_init = [-80, 357]
-                enemy = Enemy(position_init, sprite_car3, "right", 2)
-                enemys.append(enemy)
-            elif i == 3:
-                list[3] = (30 * game.speed) / game.level
-                position_init = [516, 318]
-                enemy = Enemy(position_init, sprite_car4, "left", 1)
-                enemys.append(enemy)
-            elif i == 4:
-                list[4] = (50 * game.speed) / game.level
-                position_init = [-56, 280]
-                enemy = Enemy(position_init, sprite_car5, "right", 1)
-                enemys.append(enemy)
-
-
-def createPlataform(list, plataforms, game):
-    for i, tick in enumerate(list):
-        list[i] = list[i] - 1
-        if tick <= 0:
-            if i == 0:
-                list[0] = (30 * game.speed) / game.level
-                position_init = [-100, 200]
-                plataform = Plataform(position_init, sprite_plataform, "right")
-                plataforms.append(plataform)
-            elif i == 1:
-                list[1] = (30 * game.speed) / game.level
-                position_init = [448, 161]
-                plataform = Plataform(position_init, sprite_plataform, "left")
-                plataforms.append(plataform)
-            elif i == 2:
-                list[2] = (40 * game.speed) / game.level
-                position_init = [-100, 122]
-                plataform = Plataform(position_init, sprite_plataform, "right")
-                plataforms.append(plataform)
-            elif i == 3:
-                list[3] = (40 * game.speed) / game.level
-                position_init = [448, 83]
-                plataform = Plataform(position_init, sprite_plataform, "left")
-                plataforms.append(plataform)
-            elif i == 4:
-                list[4] = (20 * game.speed) / game.level
-                position_init = [-100, 44]
-                plataform = Plataform(position_init, sprite_plataform, "right")
-                plataforms.append(plataform)
-
-
-def carChangeRoad(enemys):
-    enemy = Random.choice(enemys)
+def createPlataform(list, plataforms, game, pool=None):
+    createFromLanes(list, plataforms, game, LOG_LANES, Plataform, pool)
+
+
+def carChangeRoad(enemys, rng=Random):
+    enemy = rng.choice(enemys)
     initialPosition = enemy.position[1]
 
-    choice = Random.randint(1, 2)
+    choice = rng.randint(1, 2)
     if (choice % 2 == 0):
         enemy.position[1] = enemy.position[1] + 39
     else:
@@ -316,25 +515,26 @@ def carChangeRoad(enemys):
         enemy.position[1] = initialPosition
     elif enemy.position[1] < 280:
         enemy.position[1] = initialPosition
+    return enemy
 
 
 def frogOnTheStreet(frog, enemys, game):
+    frogRect = frog.rect()
     for i in enemys:
-        enemyRect = i.rect()
-        frogRect = frog.rect()
-        if frogRect.colliderect(enemyRect):
+        if frogRect.colliderect(i.rect()):
             hit_sound.play()
             frog.frogDead(game)
+            # na posicao inicial o sapo nao encosta em nenhum carro
+            break
 
 
 def frogInTheLake(frog, plataforms, game):
     # se o sapo esta sob alguma plataforma Seguro = 1
     seguro = 0
     wayPlataform = ""
+    frogRect = frog.rect()
     for i in plataforms:
-        plataformRect = i.rect()
-        frogRect = frog.rect()
-        if frogRect.colliderect(plataformRect):
+        if frogRect.colliderect(i.rect()):
             seguro = 1
             wayPlataform = i.way
 
@@ -350,26 +550,26 @@ def frogInTheLake(frog, plataforms, game):
             frog.position[0] = frog.position[0] - game.speed
 
 
-def frogArrived(frog, chegaram, game):
+def frogArrived(frog, chegaram, game, pool=None):
     if frog.position[0] > 33 and frog.position[0] < 53:
         position_init = [43, 7]
-        createArrived(frog, chegaram, game, position_init)
+        createArrived(frog, chegaram, game, position_init, pool)
 
     elif frog.position[0] > 115 and frog.position[0] < 135:
         position_init = [125, 7]
-        createArrived(frog, chegaram, game, position_init)
+        createArrived(frog, chegaram, game, position_init, pool)
 
     elif frog.position[0] > 197 and frog.position[0] < 217:
         position_init = [207, 7]
-        createArrived(frog, chegaram, game, position_init)
+        createArrived(frog, chegaram, game, position_init, pool)
 
     elif frog.position[0] > 279 and frog.position[0] < 299:
         position_init = [289, 7]
-        createArrived(frog, chegaram, game, position_init)
+        createArrived(frog, chegaram, game, position_init, pool)
 
     elif frog.position[0] > 361 and frog.position[0] < 381:
         position_init = [371, 7]
-        createArrived(frog, chegaram, game, position_init)
+        createArrived(frog, chegaram, game, position_init, pool)
 
     else:
         frog.position[1] = 46
@@ -378,7 +578,8 @@ def frogArrived(frog, chegaram, game):
         frog.can_move = 1
 
 
-def whereIsTheFrog(frog):
+def whereIsTheFrog(frog, enemys=enemys, plataforms=plataforms,
+                   chegaram=chegaram, game=game, pool=None):
     # Se o sapo ainda não passou da estrada
     if frog.position[1] > 240:
         frogOnTheStreet(frog, enemys, game)
@@ -389,11 +590,12 @@ def whereIsTheFrog(frog):
 
     # sapo chegou no objetivo
     elif frog.position[1] < 40:
-        frogArrived(frog, chegaram, game)
+        frogArrived(frog, chegaram, game, pool)
 
 
-def createArrived(frog, chegaram, game, position_init):
-    sapo_chegou = Object(position_init, sprite_arrived)
+def createArrived(frog, chegaram, game, position_init, pool=None):
+    sapo_chegou = spawn(pool, Object, position_init[0], position_init[1],
+                        sprite_arrived)
     chegaram.append(sapo_chegou)
     chegou_sound.play()
     frog.setPositionToInitialPosition()
@@ -404,9 +606,12 @@ def createArrived(frog, chegaram, game, position_init):
     frog.can_move = 1
 
 
-def nextLevel(chegaram, enemys, plataforms, frog, game):
+def nextLevel(chegaram, enemys, plataforms, frog, game, pool=None):
     if len(chegaram) == 5:
-        chegaram[:] = []
+        if pool is not None:
+            for i in chegaram:
+                pool.release(i)
+        del chegaram[:]
         frog.setPositionToInitialPosition()
         game.incLevel()
         game.incSpeed()
@@ -414,12 +619,215 @@ def nextLevel(chegaram, enemys, plataforms, frog, game):
         game.resetTime()
 
 
-def main():
-    clock = pygame.time.Clock()
+class Session():
+
+    # subclasses que guardam as entidades em outra estrutura desligam
+    fast_forward = True
+
+    def __init__(self, game=None, enemys=None, plataforms=None,
+                 chegaram=None, rng=None, seed=None):
+        self.game = Game(3, 1) if game is None else game
+        self.enemys = [] if enemys is None else enemys
+        self.plataforms = [] if plataforms is None else plataforms
+        self.chegaram = [] if chegaram is None else chegaram
+        # streams separadas para troca de faixa e sorteio de eventos; um
+        # random.Random passado em rng faz o papel das duas
+        self.rng = SessionRandom(seed) if rng is None else rng
+        self.seed = getattr(self.rng, "seed", seed)
+        self.lanes = getattr(self.rng, "lanes", self.rng)
+        self.events = getattr(self.rng, "events", self.rng)
+        self.tick = 0
+        self.deaths = {"car": 0, "water": 0, "time": 0}
+        # carros, troncos e sapos que chegaram sao reciclados
+        self.car_pool = Pool(Enemy)
+        self.log_pool = Pool(Plataform)
+        self.arrived_pool = Pool(Object)
+        self.hazard_table = None
+        self.newFrog()
+
+    def newFrog(self):
+        self.frog = Frog([207, 475], sprite_sapo)
+        # 30 ticks == 1 segundo; os contadores iniciais estao nas tabelas
+        self.car_spawner = SpawnScheduler(CAR_LANES, Enemy)
+        self.log_spawner = SpawnScheduler(LOG_LANES, Plataform)
+        self.ticks_time = 30
+        self.key_up = 1
+        self.key_pressed = 0
+
+    # contadores por faixa como createEnemys os guarda (gravacoes usam)
+    @property
+    def ticks_enemys(self):
+        return self.car_spawner.getCounters()
+
+    @ticks_enemys.setter
+    def ticks_enemys(self, counters):
+        self.car_spawner.setCounters(counters)
+
+    @property
+    def ticks_plataforms(self):
+        return self.log_spawner.getCounters()
+
+    @ticks_plataforms.setter
+    def ticks_plataforms(self, counters):
+        self.log_spawner.setCounters(counters)
+
+    def pressKey(self, key_pressed):
+        if self.key_up == 1 and self.frog.can_move == 1:
+            self.key_pressed = key_pressed
+            self.frog.moveFrog(key_pressed, self.key_up)
+            self.frog.cannotMove()
+            return True
+        return False
+
+    def releaseKey(self):
+        self.key_up = 1
+
+    def update(self):
+        self.countdown()
+        self.spawn()
+        self.move()
+        self.collide()
+        self.changeRoad()
+        self.frog.animateFrog(self.key_pressed, self.key_up)
+        self.cleanup()
+        self.tick += 1
+
+    def canFastForward(self):
+        # sapo parado numa linha onde nenhum carro chega e nada para pontuar:
+        # ate ele se mexer, cada tick so anda com o transito e o relogio
+        frog = self.frog
+        return (self.fast_forward and isinstance(self.events, Stream) and
+                type(self.enemys) is list and
+                type(self.plataforms) is list and
+                frog.animation_counter == 0 and frog.position[1] >= SAFE_ROW
+                and len(self.chegaram) < 5 and self.game.time > 0)
+
+    def advance(self, ticks):
+        # o mesmo que chamar update() `ticks` vezes, mas de uma vez so
+        # quando canFastForward() deixa
+        while ticks > 0:
+            if self.canFastForward():
+                fastForward(self, ticks, CAR_BOUNDS, LOG_BOUNDS)
+                return
+            self.update()
+            ticks -= 1
+
+    def hazards(self):
+        # tabela de perigo por celula do transito agendado; refeita quando
+        # nextLevel muda nivel/velocidade ou newFrog reinicia as faixas
+        offset = self.tick - self.car_spawner.now
+        cars = laneSpecs(self.car_spawner, self.game, CAR_BOUNDS, offset)
+        logs = laneSpecs(self.log_spawner, self.game, LOG_BOUNDS, offset)
+        table = self.hazard_table
+        if table is None or table.key != tuple(spec.key()
+                                               for spec in cars + logs):
+            table = self.hazard_table = HazardTable(cars, logs)
+        return table
+
+    def countdown(self):
+        if not self.ticks_time:
+            self.ticks_time = 30
+            self.game.decTime()
+        else:
+            self.ticks_time -= 1
+
+        if self.game.time == 0:
+            self.frog.frogDead(self.game)
+            self.deaths["time"] += 1
+
+    def spawn(self):
+        self.car_spawner.update(self.enemys, self.game, self.car_pool)
+        self.log_spawner.update(self.plataforms, self.game, self.log_pool)
+
+    def move(self):
+        moveList(self.enemys, self.game.speed)
+        moveList(self.plataforms, self.game.speed)
+
+    def collide(self):
+        lives = self.frog.lives
+        street = self.frog.position[1] > 240
+        self.checkFrog()
+        if self.frog.lives < lives:
+            cause = "car" if street else "water"
+            self.deaths[cause] += lives - self.frog.lives
+        nextLevel(self.chegaram, self.enemys, self.plataforms, self.frog,
+                  self.game, self.arrived_pool)
+
+    def checkFrog(self):
+        whereIsTheFrog(self.frog, self.enemys, self.plataforms,
+                       self.chegaram, self.game, self.arrived_pool)
+
+    def changeRoad(self):
+        random = self.events.randint(0, 100)
+        if (random % 100 == 0):
+            carChangeRoad(self.enemys, self.lanes)
+
+    def cleanup(self):
+        destroyEnemys(self.enemys, self.car_pool)
+        destroyPlataforms(self.plataforms, self.log_pool)
+
+    def pools(self):
+        return {"cars": self.car_pool.report(),
+                "logs": self.log_pool.report(),
+                "arrived": self.arrived_pool.report()}
+
+    def draw(self, items=None):
+        screen.blit(background, (0, 0))
+        if items is None:
+            items = self.drawItems()
+        for key, surface, position, area in items:
+            screen.blit(surface, position, area)
+
+    def drawItems(self):
+        text_info1 = hud.line('Level: {0}               Points: {1}',
+                              (self.game.level, self.game.points))
+        text_info2 = hud.line('Time: {0}           Lifes: {1}',
+                              (self.game.time, self.frog.lives))
+        items = [(("hud", 1), text_info1, (10, 520), None),
+                 (("hud", 2), text_info2, (250, 520), None)]
+        items.extend(self.entityItems())
+        items.append(self.frog.drawItem())
+        return items
+
+    def entityItems(self):
+        return [i.drawItem() for entities in
+                (self.enemys, self.plataforms, self.chegaram)
+                for i in entities]
+
+
+def main(dirty_rects=False, startup_report=False, seed=None, record=None,
+         max_catch_up=5, render_rate=None, frame_skip=None, autopilot=False):
+    from game.loop import FixedStep, FrameSkipper
+    stepper = FixedStep(max_steps=max_catch_up)
+    skipper = FrameSkipper(frame_skip) if frame_skip else None
+    session = Session(game, enemys, plataforms, chegaram, seed=seed)
+    renderer = None
+    if dirty_rects:
+        from game.render import DirtyRenderer
+        renderer = DirtyRenderer(screen, background)
+    # desenha na taxa do monitor, entre as posicoes dos dois ultimos ticks
+    interpolator = None
+    if render_rate:
+        from game.render import Interpolator
+        interpolator = Interpolator()
+        frame_clock = pygame.time.Clock()
+    from game.profiler import FrameProfiler
+    profiler = FrameProfiler()
+    profiler.attach(session)
+    recorder = None
+    if record:
+        from game.recording import Recorder
+        recorder = Recorder(record, session.seed)
+    # o sapo joga sozinho (modo demonstracao)
+    pilot = None
+    if autopilot:
+        from game.policies import SearchPolicy
+        pilot = SearchPolicy(bounds=(CAR_BOUNDS, LOG_BOUNDS))
 
-    trilha_sound.play(-1)
     text_info = menu_font.render(('Press any button to start!'), 1, (0, 0, 0))
     gameInit = 0
+    first_frame = True
+    music = False
 
     while gameInit == 0:
         for event in pygame.event.get():
@@ -432,82 +840,109 @@ def main():
         screen.blit(text_info, (80, 150))
         pygame.display.update()
 
+        if first_frame:
+            first_frame = False
+            startup["first_frame"] = time.perf_counter() - STARTED
+        # a trilha so comeca depois que a tela ja apareceu
+        music = startMusic(music, startup_report)
+
     while True:
         gameInit = 1
-        key_up = 1
-        frog_initial_position = [207, 475]
-        frog = Frog(frog_initial_position, sprite_sapo)
+        session.newFrog()
+        if recorder:
+            recorder.attach(session)
+        if renderer:
+            renderer.invalidate()
 
-        # 30 ticks == 1 segundo
-        # ticks_enemys = [120, 90, 120, 90, 150]
-        # ticks_plataforms = [90, 90, 120, 120, 60]
-        ticks_enemys = [30, 0, 30, 0, 60]
-        ticks_plataforms = [0, 0, 30, 30, 30]
-        ticks_time = 30
-        pressed_keys = 0
-        key_pressed = 0
+        profiler.start()
+        stepper.reset()
 
-        while frog.lives > 0:
+        while session.frog.lives > 0:
 
             for event in pygame.event.get():
                 if event.type == QUIT:
+                    if renderer:
+                        print(renderer.report())
+                    if skipper:
+                        print(skipper.report())
+                    if recorder:
+                        recorder.close()
                     exit()
                 if event.type == KEYUP:
-                    key_up = 1
+                    session.releaseKey()
                 if event.type == KEYDOWN:
-                    if key_up == 1 and frog.can_move == 1:
-                        key_pressed = pygame.key.name(event.key)
-                        frog.moveFrog(key_pressed, key_up)
-                        frog.cannotMove()
-            if not ticks_time:
-                ticks_time = 30
-                game.decTime()
+                    # F3 mostra o profiler, F4 salva o historico em CSV/JSON
+                    if event.key == K_F3:
+                        profiler.toggle()
+                    elif event.key == K_F4:
+                        print(profiler.exportAll())
+                    else:
+                        session.pressKey(pygame.key.name(event.key))
+            music = startMusic(music, startup_report)
+            profiler.lap("events")
+
+            # ticks de 1/30 s do relogio: um frame lento e compensado com
+            # mais ticks antes do proximo desenho
+            if skipper:
+                stepper.max_steps = min(max_catch_up, skipper.allowed())
+            steps = 0
+            for i in range(stepper.advance()):
+                if interpolator:
+                    interpolator.capture(session.drawItems())
+                if pilot:
+                    key = pilot.act(session)
+                    if key:
+                        session.pressKey(key)
+                session.update()
+                steps += 1
+                if session.frog.lives <= 0:
+                    break
+            profiler.lap("other")
+
+            # com --frame-skip o desenho fica para depois quando faria o
+            # proximo tick atrasar
+            draw = True
+            if skipper:
+                skipper.ticked(steps)
+                draw = skipper.shouldDraw(stepper.remaining())
+            if draw:
+                drawing = time.perf_counter()
+                items = session.drawItems()
+                if interpolator:
+                    items = interpolator.blend(items, stepper.alpha())
+                if renderer:
+                    if profiler.visible:
+                        items.append(profiler.drawItem())
+                    dirty = renderer.draw(items)
+                    profiler.lap("draw")
+                    pygame.display.update(dirty)
+                else:
+                    session.draw(items)
+                    if profiler.visible:
+                        screen.blit(profiler.render(), (4, 4))
+                    profiler.lap("draw")
+                    pygame.display.update()
+                profiler.lap("display")
+                if skipper:
+                    skipper.drew(time.perf_counter() - drawing)
+
+            if interpolator:
+                frame_clock.tick(render_rate)
             else:
-                ticks_time -= 1
-
-            if game.time == 0:
-                frog.frogDead(game)
-
-            createEnemys(ticks_enemys, enemys, game)
-            createPlataform(ticks_plataforms, plataforms, game)
+                stepper.wait()
+            profiler.lap("wait")
+            profiler.endFrame()
 
-            moveList(enemys, game.speed)
-            moveList(plataforms, game.speed)
-
-            whereIsTheFrog(frog)
-
-            nextLevel(chegaram, enemys, plataforms, frog, game)
-
-            text_info1 = info_font.render(
-                ('Level: {0}               Points: {1}'.format(
-                    game.level, game.points)), 1, (255, 255, 255))
-            text_info2 = info_font.render(
-                ('Time: {0}           Lifes: {1}'.format(
-                    game.time, frog.lives)), 1, (255, 255, 255))
-            screen.blit(background, (0, 0))
-            screen.blit(text_info1, (10, 520))
-            screen.blit(text_info2, (250, 520))
-
-            random = Random.randint(0, 100)
-            if (random % 100 == 0):
-                carChangeRoad(enemys)
-
-            drawList(enemys)
-            drawList(plataforms)
-            drawList(chegaram)
-
-            frog.animateFrog(key_pressed, key_up)
-            frog.draw()
-
-            destroyEnemys(enemys)
-            destroyPlataforms(plataforms)
-
-            pygame.display.update()
-            time_passed = clock.tick(30)
+        if renderer:
+            print(renderer.report())
+        if skipper:
+            print(skipper.report())
 
         while gameInit == 1:
             for event in pygame.event.get():
                 if event.type == QUIT:
+                    if recorder:
+                        recorder.close()
                     exit()
                 if event.type == KEYDOWN:
                     if event.key == pygame.K_RETURN:
@@ -516,7 +951,7 @@ def main():
             screen.blit(background, (0, 0))
             text = game_font.render('GAME OVER', 1, (255, 0, 0))
             text_points = game_font.render(
-                ('Pontuação: {0}'.format(game.points)), 1, (255, 0, 0))
+                ('Pontuação: {0}'.format(session.game.points)), 1, (255, 0, 0))
             text_reiniciar = info_font.render(
                 'Pressione qualquer tecla para reiniciar!', 1, (255, 0, 0))
             screen.blit(text, (75, 120))
@@ -526,5 +961,50 @@ def main():
             pygame.display.update()
 
 
+def startupReport():
+    return {name: round(seconds * 1000, 1)
+            for name, seconds in startup.items()}
+
+
+startup["import"] = time.perf_counter() - STARTED
+
 if __name__ == "__main__":
-    main()
+    if sys.argv[1:2] == ['rollout']:
+        from game import rollout
+        rollout.main(sys.argv[2:])
+    elif sys.argv[1:2] == ['replay']:
+        from game import recording
+        recording.main(sys.argv[2:])
+    elif sys.argv[1:2] == ['policy']:
+        from game import policytable
+        policytable.main(sys.argv[2:])
+    else:
+        import argparse
+        parser = argparse.ArgumentParser(prog='python -m game.frogger')
+        parser.add_argument('--dirty-rects', action='store_true',
+                            help='only redraw the areas that changed')
+        parser.add_argument('--startup-report', action='store_true',
+                            help='print import, first frame and audio '
+                                 'load times in ms')
+        parser.add_argument('--seed', type=int,
+                            help='replay the same lane changes as a '
+                                 'previous game')
+        parser.add_argument('--record', metavar='PATH',
+                            help='record the moves for '
+                                 'python -m game.frogger replay PATH')
+        parser.add_argument('--max-catch-up', type=int, default=5,
+                            help='most ticks run between two frames when '
+                                 'the game falls behind')
+        pacing = parser.add_mutually_exclusive_group()
+        pacing.add_argument('--render-rate', type=int, metavar='HZ',
+                            help='draw at this rate with motion '
+                                 'interpolated between ticks')
+        pacing.add_argument('--frame-skip', type=int, metavar='N',
+                            help='skip up to N frames in a row when drawing '
+                                 'would make the game fall behind')
+        parser.add_argument('--autopilot', action='store_true',
+                            help='let the search bot play')
+        args = parser.parse_args()
+        main(args.dirty_rects, args.startup_report, args.seed, args.record,
+             args.max_catch_up, args.render_rate, args.frame_skip,
+             args.autopilot)
@@ -0,0 +1,148 @@
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from game.kinematics import lifetime, velocity
+
+CELL = 13
+COLUMNS = 448 // CELL + 1
+FROG = 30
+# the rows the frog can stand on, from the start row up to the homes
+START = 475
+ROWS = tuple(range(START, 40, -CELL))
+RIVER = 240
+
+
+class LaneSpec():
+    # one lane of scheduled traffic: where it runs and the tick residue,
+    # modulo its period, of its spawns
+
+    def __init__(self, y, height, x, v, width, life, period, residue):
+        self.y = y
+        self.height = height
+        self.x = x
+        self.v = v
+        self.width = width
+        self.life = life
+        self.period = period
+        self.residue = residue
+
+    def key(self):
+        return (self.y, self.height, self.x, self.v, self.width, self.life,
+                self.period, self.residue)
+
+
+def laneSpecs(spawner, game, bounds, offset=0):
+    # `offset` turns the spawner's ticks into session ticks
+    specs = []
+    for due, i in sorted(spawner.heap, key=lambda entry: entry[1]):
+        x, y, first, interval, sprite, way, *rest = spawner.lanes[i]
+        v = velocity(way, rest[0] if rest else 1, game.speed)
+        period = spawner.period(i, game)
+        specs.append(LaneSpec(y, sprite.get_height(), x, v,
+                              sprite.get_width(), lifetime(x, v, *bounds),
+                              period, (due + offset) % period))
+    return specs
+
+
+def overlaps(x, width, cells, street):
+    # frog cells against entities at x: on the street a cell is hit when
+    # any x in it touches a car, on the river it is carried when one log
+    # holds every x in it (Rect.colliderect rules)
+    left = cells * CELL
+    right = left + CELL - 1
+    if street:
+        return (left < x + width) & (right > x - FROG)
+    return (x - FROG < left) & (right < x + width)
+
+
+def laneTimeline(spec, street):
+    # [phase, cell]: a spawn of phase p ticks ago is in the lane at age
+    # p + 1, p + 1 + period, ... until it leaves, on the tick's collide()
+    period = spec.period
+    ages = np.arange(period)[:, None] + 1 + \
+        period * np.arange(max(((spec.life or 0) + 1) // period + 1, 1))
+    alive = ages <= (spec.life if spec.life is not None else 0) + 1
+    x = spec.x + spec.v * ages
+    cells = np.arange(COLUMNS)
+    hit = overlaps(x[:, :, None], spec.width, cells, street)
+    return (hit & alive[:, :, None]).any(axis=1)
+
+
+def nextSafe(safe):
+    # ticks from each [tick, cell] of a cyclic timeline to the next safe
+    # one, -1 where it never comes
+    length = len(safe)
+    ticks = np.arange(2 * length)[:, None]
+    due = np.where(np.concatenate((safe, safe)), ticks, 4 * length)
+    due = np.minimum.accumulate(due[::-1], axis=0)[::-1][:length]
+    wait = due - ticks[:length]
+    wait[wait >= 2 * length] = -1
+    return wait.astype(np.int32)
+
+
+# Safe/deadly timeline of every cell the frog can stand on, built from the
+# lane schedule: a row takes the lanes it overlaps, and its timeline
+# repeats every lcm of their periods, so safe() and nextSafe() are one
+# lookup. It knows the scheduled traffic only: random lane changes and
+# cars spawned at an older speed are not in it, and lanes are assumed to
+# have always been spawning, so right after a new game it also counts cars
+# and logs that have not come in yet.
+class HazardTable():
+
+    def __init__(self, cars, logs):
+        if np is None:
+            raise ImportError("HazardTable requires numpy")
+        self.key = tuple(spec.key() for spec in cars + logs)
+        lanes = {}
+        self.rows = {}
+        for y in ROWS:
+            street = y > RIVER
+            specs = [spec for spec in (cars if street else logs)
+                     if y < spec.y + spec.height and y + FROG > spec.y]
+            length = 1
+            for spec in specs:
+                length = length * spec.period // math.gcd(length,
+                                                          spec.period)
+            ticks = np.arange(length)
+            if street:
+                safe = np.ones((length, COLUMNS), bool)
+            else:
+                safe = np.zeros((length, COLUMNS), bool)
+            for spec in specs:
+                timeline = lanes.get(id(spec))
+                if timeline is None:
+                    timeline = lanes[id(spec)] = laneTimeline(spec, street)
+                phases = timeline[(ticks - spec.residue) % spec.period]
+                if street:
+                    safe &= ~phases
+                else:
+                    safe |= phases
+            self.rows[y] = (length, safe, nextSafe(safe))
+
+    def lookup(self, x, y, tick):
+        row = self.rows.get(y)
+        if row is None:
+            return None, 0, 0
+        cell = min(max(int(x) // CELL, 0), COLUMNS - 1)
+        return row, tick % row[0], cell
+
+    def safe(self, x, y, tick):
+        row, phase, cell = self.lookup(x, y, tick)
+        return row is None or bool(row[1][phase, cell])
+
+    def nextSafe(self, x, y, tick):
+        # first tick >= `tick` the cell is safe on, None if never
+        row, phase, cell = self.lookup(x, y, tick)
+        if row is None:
+            return tick
+        wait = int(row[2][phase, cell])
+        return None if wait < 0 else tick + wait
+
+    def danger(self, y):
+        # share of the row's cell-ticks that are deadly
+        row = self.rows.get(y)
+        return 0.0 if row is None else float(1 - row[1].mean())
@@ -0,0 +1,186 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from game.pool import spawn
+from game.rng import GAMMA, MASK, mix, mixArray
+
+WAYS = {"right": 1, "left": -1}
+CHUNK = 1 << 16
+# fewer draws than this are cheaper mixed one at a time than with numpy
+FEW_DRAWS = 32
+
+
+def velocity(way, factor, speed):
+    return WAYS.get(way, 0) * factor * speed
+
+
+def lifetime(x, v, left, right):
+    # moves an entity at x can make before leaving [left, right]; None when
+    # it stands still
+    if v > 0:
+        return (right - x) // v
+    if v < 0:
+        return (x - left) // -v
+    return None
+
+
+def ceilDiv(a, b):
+    return -(-a // b)
+
+
+def laneChangeTicks(stream, ticks):
+    # the ticks of the next `ticks` on which Session.changeRoad moves a car,
+    # i.e. where events.randint(0, 100) % 100 == 0; the draws are consumed
+    start = stream.counter
+    found = []
+    if np is not None and ticks >= FEW_DRAWS:
+        key = np.uint64(stream.key)
+        for offset in range(0, ticks, CHUNK):
+            counters = np.arange(start + offset,
+                                 start + min(offset + CHUNK, ticks),
+                                 dtype=np.uint64)
+            values = mixArray(key + counters * np.uint64(GAMMA))
+            hits = np.flatnonzero(values % np.uint64(101) % np.uint64(100)
+                                  == 0)
+            found.extend((hits + offset).tolist())
+    else:
+        for j in range(ticks):
+            value = mix((stream.key + (start + j) * GAMMA) & MASK)
+            if value % 101 % 100 == 0:
+                found.append(j)
+    stream.counter = start + ticks
+    return found
+
+
+# The cars or the logs of a session over `ticks` skipped ticks. Between
+# spawns everything moves at a constant velocity, so an entity's x after
+# tick j (counted from 0 in the skipped stretch) is its x now, or its spawn
+# x, plus velocity times the moves made, and the tick it leaves the screen
+# follows from lifetime(). Entities that come and go inside the stretch are
+# never built: they are (lane, k) handles for the k-th spawn of a lane.
+class Traffic():
+
+    def __init__(self, entities, spawner, ticks, game, bounds):
+        speed = game.speed
+        left, right = bounds
+        self.ticks = ticks
+        self.spawner = spawner
+        self.entities = list(entities)
+        self.velocities = [velocity(e.way, getattr(e, "factor", 1), speed)
+                           for e in self.entities]
+        self.lives = [lifetime(e.position[0], v, left, right)
+                      for e, v in zip(self.entities, self.velocities)]
+        self.lanes = []
+        schedule = spawner.skip(ticks, game)
+        for lane, (first, period, count) in zip(spawner.lanes, schedule):
+            x, y, initial, interval, sprite, way, *rest = lane
+            v = velocity(way, rest[0] if rest else 1, speed)
+            self.lanes.append((first, period, count, x, y, v,
+                               lifetime(x, v, left, right)))
+        # y of the skipped spawns that changed lanes
+        self.rows = {}
+
+    def spawned(self, lane, low, high):
+        # k of the spawns of `lane` made on ticks low..high
+        first, period, count = self.lanes[lane][:3]
+        start = max(ceilDiv(low - first, period), 0)
+        stop = min((high - first) // period, count - 1)
+        return range(start, stop + 1)
+
+    def alive(self, j):
+        # the entity list as Session.changeRoad sees it on tick j
+        handles = [e for e, life in zip(self.entities, self.lives)
+                   if life is None or life >= j]
+        spawns = []
+        for i, (first, period, count, x, y, v, life) in enumerate(self.lanes):
+            low = 0 if life is None else j - life
+            spawns.extend((first + k * period, i, k)
+                          for k in self.spawned(i, low, j))
+        spawns.sort()
+        handles.extend((i, k) for s, i, k in spawns)
+        return handles
+
+    def row(self, handle):
+        if isinstance(handle, tuple):
+            return self.rows.get(handle, self.lanes[handle[0]][4])
+        return handle.position[1]
+
+    def setRow(self, handle, y):
+        if isinstance(handle, tuple):
+            self.rows[handle] = y
+        else:
+            handle.position[1] = y
+
+    def changeRoad(self, j, rng, top=280, bottom=436):
+        # carChangeRoad on the entities of tick j, same draws
+        handle = rng.choice(self.alive(j))
+        choice = rng.randint(1, 2)
+        y = self.row(handle)
+        y = y + 39 if choice % 2 == 0 else y - 39
+        if top <= y <= bottom:
+            self.setRow(handle, y)
+
+    def finish(self, entities, pool=None):
+        # leaves `entities` as cleanup() would after the last skipped tick
+        ticks = self.ticks
+        kept = []
+        for e, v, life in zip(self.entities, self.velocities, self.lives):
+            if life is None or life >= ticks:
+                e.position[0] = e.position[0] + v * ticks
+                kept.append(e)
+            elif pool is not None:
+                pool.release(e)
+        spawns = []
+        for i, (first, period, count, x, y, v, life) in enumerate(self.lanes):
+            low = 0 if life is None else ticks - life
+            spawns.extend((first + k * period, i, k)
+                          for k in self.spawned(i, low, ticks - 1))
+        spawns.sort()
+        cls = self.spawner.cls
+        for s, i, k in spawns:
+            first, period, count, x, y, v, life = self.lanes[i]
+            args = self.spawner.lanes[i][4:]
+            kept.append(spawn(pool, cls, x + v * (ticks - s),
+                              self.rows.get((i, k), y), *args))
+        entities[:] = kept
+
+
+def countdown(session, ticks):
+    # Session.countdown run `ticks` times: the clock loses a second every
+    # 31 ticks and the frog dies each time it reaches 0
+    game = session.game
+    wait = session.ticks_time
+    if ticks <= wait:
+        session.ticks_time = wait - ticks
+        return 0
+    seconds = (ticks - 1 - wait) // 31 + 1
+    last = wait + 31 * (seconds - 1)
+    session.ticks_time = 30 - (ticks - 1 - last)
+    left = game.time
+    if seconds < left:
+        game.time = left - seconds
+        return 0
+    deaths = 1 + (seconds - left) // 30
+    session.frog.frogDead(game)
+    session.frog.lives -= deaths - 1
+    game.time = 30 - (seconds - left) % 30
+    session.deaths["time"] += deaths
+    return deaths
+
+
+def fastForward(session, ticks, car_bounds, log_bounds):
+    # `ticks` calls of Session.update() with the frog idle out of reach of
+    # the cars; see Session.canFastForward for when that holds
+    game = session.game
+    countdown(session, ticks)
+    cars = Traffic(session.enemys, session.car_spawner, ticks, game,
+                   car_bounds)
+    logs = Traffic(session.plataforms, session.log_spawner, ticks, game,
+                   log_bounds)
+    for j in laneChangeTicks(session.events, ticks):
+        cars.changeRoad(j, session.lanes)
+    cars.finish(session.enemys, session.car_pool)
+    logs.finish(session.plataforms, session.log_pool)
+    session.tick += ticks
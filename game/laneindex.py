@@ -0,0 +1,90 @@
+import bisect
+
+
+def positionX(entity):
+    return entity.position[0]
+
+
+# Entities bucketed by row and velocity and kept sorted by x. Everything in
+# a bucket moves by the same amount each tick, so the order never changes.
+class LaneIndex():
+
+    def __init__(self):
+        self.lanes = {}
+        self.widths = {}
+        self.heights = {}
+        self.keys = {}
+        self.order = 0
+
+    def __len__(self):
+        return len(self.keys)
+
+    def laneKey(self, entity):
+        return (entity.position[1], entity.way,
+                getattr(entity, "factor", 1))
+
+    def add(self, entity, order=None):
+        key = self.laneKey(entity)
+        if order is None:
+            order = self.order
+            self.order += 1
+        lane = self.lanes.get(key)
+        if lane is None:
+            lane = self.lanes[key] = []
+            self.widths[key] = 0
+            self.heights[key] = 0
+        bisect.insort(lane, entity, key=positionX)
+        self.widths[key] = max(self.widths[key], entity.sprite.get_width())
+        self.heights[key] = max(self.heights[key],
+                                entity.sprite.get_height())
+        self.keys[id(entity)] = (key, order)
+
+    def remove(self, entity):
+        key, order = self.keys.pop(id(entity))
+        lane = self.lanes[key]
+        i = bisect.bisect_left(lane, entity.position[0], key=positionX)
+        while lane[i] is not entity:
+            i += 1
+        del lane[i]
+        if not lane:
+            del self.lanes[key], self.widths[key], self.heights[key]
+        return order
+
+    def update(self, entity):
+        key, order = self.keys[id(entity)]
+        if key != self.laneKey(entity):
+            self.add(entity, self.remove(entity))
+
+    def query(self, rect):
+        found = []
+        for key, lane in self.lanes.items():
+            y = key[0]
+            if y >= rect.bottom or y + self.heights[key] <= rect.top:
+                continue
+            i = bisect.bisect_right(lane, rect.left - self.widths[key],
+                                    key=positionX)
+            while i < len(lane) and lane[i].position[0] < rect.right:
+                if rect.colliderect(lane[i].rect()):
+                    found.append(lane[i])
+                i += 1
+        if len(found) > 1:
+            found.sort(key=lambda entity: self.keys[id(entity)][1])
+        return found
+
+    def prune(self, entities, left, right):
+        live = set(map(id, entities))
+        gone = []
+        for lane in self.lanes.values():
+            for entity in lane:
+                if entity.position[0] >= left:
+                    break
+                if id(entity) not in live:
+                    gone.append(entity)
+            for entity in reversed(lane):
+                if entity.position[0] <= right:
+                    break
+                if id(entity) not in live:
+                    gone.append(entity)
+        for entity in gone:
+            self.remove(entity)
+
@@ -0,0 +1,89 @@
+from game import frogger
+
+
+# FIFO of one lane's entities. They all spawn at the same edge and move at
+# the same velocity, so they leave the screen in the order they came in.
+class Ring():
+
+    def __init__(self, capacity=8):
+        self.items = [None] * capacity
+        self.head = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        size = len(self.items)
+        for k in range(self.count):
+            yield self.items[(self.head + k) % size]
+
+    def push(self, entity):
+        if self.count == len(self.items):
+            self.grow()
+        self.items[(self.head + self.count) % len(self.items)] = entity
+        self.count += 1
+
+    def peek(self):
+        return self.items[self.head]
+
+    def pop(self):
+        entity = self.items[self.head]
+        self.items[self.head] = None
+        self.head = (self.head + 1) % len(self.items)
+        self.count -= 1
+        return entity
+
+    def grow(self):
+        entities = list(self)
+        self.items = entities + [None] * len(entities)
+        self.head = 0
+
+
+# Drop-in for the enemys/plataforms lists: it is one, in spawn order, for
+# moving, collisions and drawing, and a ring per lane lets despawn look at
+# the lane heads only. What leaves is the oldest of its lane, so it sits
+# near the front of the list.
+class LaneRings(list):
+
+    def __init__(self, left, right):
+        list.__init__(self)
+        self.left = left
+        self.right = right
+        self.rings = {}
+
+    def append(self, entity):
+        key = (entity.position[1], entity.way)
+        ring = self.rings.get(key)
+        if ring is None:
+            ring = self.rings[key] = Ring()
+        ring.push(entity)
+        list.append(self, entity)
+
+    def despawn(self):
+        removed = []
+        left, right = self.left, self.right
+        for ring in self.rings.values():
+            # peek() inlined: this runs for every lane on every tick
+            items = ring.items
+            while (ring.count and
+                   not left <= items[ring.head].position[0] <= right):
+                removed.append(ring.pop())
+        for entity in removed:
+            self.remove(entity)
+        return removed
+
+
+class RingSession(frogger.Session):
+
+    def __init__(self, game=None, rng=None, seed=None):
+        frogger.Session.__init__(self, game,
+                                 LaneRings(*frogger.CAR_BOUNDS),
+                                 LaneRings(*frogger.LOG_BOUNDS), None, rng,
+                                 seed)
+
+    def cleanup(self):
+        for enemy in self.enemys.despawn():
+            self.car_pool.release(enemy)
+        for plataform in self.plataforms.despawn():
+            self.log_pool.release(plataform)
@@ -0,0 +1,94 @@
+import time
+
+
+# Fixed-timestep scheduler for main(): the game advances in 1/30 s ticks
+# of wall-clock time whatever the frame rate, a slow frame is made up by
+# running several ticks before the next draw, and at most `max_steps` are
+# run at once so a machine that cannot keep up does not fall further and
+# further behind.
+class FixedStep():
+
+    def __init__(self, rate=30, max_steps=5, clock=time.perf_counter,
+                 sleep=time.sleep):
+        self.step = 1.0 / rate
+        self.max_steps = max_steps
+        self.clock = clock
+        self.sleep = sleep
+        self.ticks = 0
+        self.dropped = 0
+        self.reset()
+
+    def reset(self):
+        self.accumulator = 0.0
+        self.last = self.clock()
+
+    def advance(self):
+        now = self.clock()
+        self.accumulator += now - self.last
+        self.last = now
+        # the epsilon keeps a tick that is due exactly now from rounding
+        # down to the next wake-up
+        steps = int(self.accumulator / self.step + 1e-6)
+        if steps > self.max_steps:
+            # give up on the time that cannot be caught up
+            self.dropped += steps - self.max_steps
+            steps = self.max_steps
+            self.accumulator = steps * self.step
+        self.accumulator -= steps * self.step
+        self.ticks += steps
+        return steps
+
+    def alpha(self):
+        return max(0.0, min(self.accumulator / self.step, 1.0))
+
+    def remaining(self):
+        # seconds until the next tick is due
+        return self.last + self.step - self.accumulator - self.clock()
+
+    def wait(self):
+        remaining = self.remaining()
+        if remaining > 0:
+            self.sleep(remaining)
+
+    def report(self):
+        return {"ticks": self.ticks, "dropped_ticks": self.dropped}
+
+
+# Frame skipping for FixedStep: every tick is a frame that could be shown,
+# and when the game is already late for its next tick the frame is dropped
+# so the ticks get back on schedule first. At most `max_skip` ticks in a
+# row go undrawn; allowed() is the catch-up limit for the stepper that
+# keeps it so.
+class FrameSkipper():
+
+    def __init__(self, max_skip=4, smoothing=0.25):
+        self.max_skip = max_skip
+        self.smoothing = smoothing
+        self.cost = 0.0
+        self.pending = 0
+        self.drawn = 0
+        self.skipped = 0
+
+    def allowed(self):
+        return max(self.max_skip + 1 - self.pending, 1)
+
+    def ticked(self, steps):
+        self.pending += steps
+
+    def shouldDraw(self, remaining):
+        if not self.pending:
+            return False
+        return self.pending > self.max_skip or remaining > 0
+
+    def drew(self, seconds):
+        if self.drawn:
+            self.cost += (seconds - self.cost) * self.smoothing
+        else:
+            self.cost = seconds
+        self.skipped += max(self.pending - 1, 0)
+        self.pending = 0
+        self.drawn += 1
+
+    def report(self):
+        return {"frames_drawn": self.drawn, "frames_skipped": self.skipped,
+                "draw_ms": round(self.cost * 1000, 2)}
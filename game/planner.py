@@ -0,0 +1,279 @@
+import copy
+import heapq
+import time
+
+from game.kinematics import laneChangeTicks, lifetime, velocity
+from game.rng import Stream
+
+# (left, right) open x ranges of the homes, as in frogArrived
+HOMES = ((33, 53), (115, 135), (197, 217), (279, 299), (361, 381))
+SLOTS = (43, 125, 207, 289, 371)
+KEYS = ("up", "left", "right", "down")
+FROG = 30
+# a key press moves the frog three times: on the press, on the second
+# update and on the fourth; sideways the steps are 14, 13 and 14 px
+STEPS = (14, 13, 14)
+MOVE_TICKS = 4
+
+
+def step(x, y, key, size):
+    # Frog.moveFrog's bounds checks
+    if key == "up":
+        if y > 39:
+            y -= 13
+    elif key == "down":
+        if y < 473:
+            y += 13
+    elif key == "left":
+        if x > 2:
+            x -= size
+    elif key == "right":
+        if x < 401:
+            x += size
+    return x, y
+
+
+# Cars and logs of a session for the next `horizon` ticks: the ones on
+# screen keep their velocity until they leave, and the spawner's schedule
+# adds the ones still to come. Tick j is the j-th update() from now. Lane
+# changes are drawn from copies of the session's streams, so they come out
+# as the game will make them; the streams are only copied when a car does
+# change lanes in the horizon.
+class Forecast():
+
+    def __init__(self, session, horizon, car_bounds, log_bounds,
+                 rows=None):
+        # `rows`, a (top, bottom) range of y, leaves out the movers that
+        # never touch it, unless a car changes lanes in the horizon
+        self.horizon = horizon
+        self.game = session.game
+        changing = self.laneChanges(session)
+        if changing:
+            rows = None
+        self.cars = self.movers(session.enemys, session.car_spawner,
+                                car_bounds, rows)
+        self.logs = self.movers(session.plataforms, session.log_spawner,
+                                log_bounds, rows)
+        if changing:
+            self.changeRoads(session)
+        self.rows = {}
+
+    def laneChanges(self, session):
+        # whether Session.changeRoad moves a car in the horizon; a Stream is
+        # read ahead on a copy of its counter, another generator is assumed
+        # to
+        if not isinstance(session.events, Stream):
+            return True
+        return bool(laneChangeTicks(copy.copy(session.events), self.horizon))
+
+    def movers(self, entities, spawner, bounds, rows=None):
+        # (top, bottom, width, base, v, first, last, order): x on tick j is
+        # base + v * j while first <= j <= last
+        end = self.horizon
+        speed = self.game.speed
+        movers = []
+        for order, e in enumerate(entities):
+            y = e.position[1]
+            height = e.rect().height
+            if rows and not (y < rows[1] and y + height > rows[0]):
+                continue
+            v = velocity(e.way, getattr(e, "factor", 1), speed)
+            life = lifetime(e.position[0], v, *bounds)
+            movers.append((y, y + height, e.rect().width, e.position[0] + v,
+                           v, 0, end if life is None else life, (0, order)))
+        for due, i in spawner.heap:
+            x, y, first, interval, sprite, way, *rest = spawner.lanes[i]
+            if rows and not (y < rows[1] and
+                             y + sprite.get_height() > rows[0]):
+                continue
+            v = velocity(way, rest[0] if rest else 1, speed)
+            life = lifetime(x, v, *bounds)
+            period = spawner.period(i, self.game)
+            s = due - spawner.now
+            while s < end:
+                movers.append((y, y + sprite.get_height(), sprite.get_width(),
+                               x + v * (1 - s), v, s,
+                               end if life is None else s + life, (1, s, i)))
+                s += period
+        movers.sort(key=lambda mover: mover[7])
+        return movers
+
+    def changeRoads(self, session, top=280, bottom=436):
+        # Session.changeRoad on every tick: the car picked on tick j takes
+        # its new row from tick j + 1 on
+        if session.lanes is session.events:
+            lanes = events = copy.deepcopy(session.events)
+        else:
+            lanes = copy.deepcopy(session.lanes)
+            events = copy.deepcopy(session.events)
+        cars = self.cars
+        for j in range(self.horizon):
+            if events.randint(0, 100) % 100:
+                continue
+            alive = [i for i, car in enumerate(cars)
+                     if car[5] <= j <= car[6]]
+            if not alive:
+                continue
+            i = lanes.choice(alive)
+            y, bottom_y, width, base, v, first, last, order = cars[i]
+            moved = y + 39 if lanes.randint(1, 2) % 2 == 0 else y - 39
+            if top <= moved <= bottom and j < last:
+                cars[i] = (y, bottom_y, width, base, v, first, j, order)
+                cars.insert(i + 1, (moved, moved + bottom_y - y, width, base,
+                                    v, j + 1, last, order))
+
+    def active(self, y, j):
+        # (x, width, v) of the movers that can touch a frog on row y on
+        # tick j, in list order
+        found = self.rows.get((y, j))
+        if found is None:
+            movers = self.cars if y > 240 else self.logs
+            found = self.rows[(y, j)] = [
+                (base + v * j, width, v)
+                for top, bottom, width, base, v, first, last, order in movers
+                if first <= j <= last and y < bottom and y + FROG > top]
+        return found
+
+    def touching(self, x, y, j):
+        found = None
+        for mx, width, v in self.active(y, j):
+            if x < mx + width and x + FROG > mx:
+                found = v
+                if y > 240:
+                    return v
+        return found
+
+    def update(self, x, y, j):
+        # the frog's x after collide() on tick j, None if it dies there
+        if y > 240:
+            return None if self.touching(x, y, j) is not None else x
+        if 40 < y < 240:
+            v = self.touching(x, y, j)
+            return None if v is None else x + v
+        return x
+
+
+def arrived(x, homes):
+    return any(left < x < right for left, right in homes)
+
+
+# Time-expanded A* over (x, y, tick) from the frog's current state to a
+# home: a node is a moment the frog can take a key, and its successors
+# are waiting one tick or one of the four moves, each checked tick by tick
+# against the forecast. The cost is ticks, the heuristic the moves left to
+# climb to the homes. A search stops after `budget` seconds or `max_nodes`
+# expanded nodes, whichever comes first; the node limit alone gives the same
+# path on every machine.
+class Planner():
+
+    def __init__(self, car_bounds, log_bounds, horizon=450, budget=0.015,
+                 max_nodes=None):
+        self.car_bounds = car_bounds
+        self.log_bounds = log_bounds
+        self.horizon = horizon
+        self.budget = budget
+        self.max_nodes = max_nodes
+        self.resetCounters()
+
+    def resetCounters(self):
+        self.plans = 0
+        self.nodes = 0
+        self.seconds = 0.0
+
+    def homes(self, chegaram):
+        taken = {arrived_frog.position[0] for arrived_frog in chegaram}
+        homes = [home for home, slot in zip(HOMES, SLOTS)
+                 if slot not in taken]
+        return homes or list(HOMES)
+
+    def heuristic(self, y):
+        # a press climbs three rows and the last one arrives on its first
+        steps = -(-(y - 39) // 13)
+        return max(-(-steps // 3) - 1, 0) * MOVE_TICKS
+
+    def move(self, forecast, x, y, j, key, homes):
+        # the four updates of a key press; returns the state at the next
+        # press, "home" when it arrives, None when the frog dies or would be
+        # sent back from a wall between the homes
+        x, y = step(x, y, key, STEPS[0])
+        for k in range(MOVE_TICKS):
+            if y < 40:
+                return "home" if arrived(x, homes) else None
+            x = forecast.update(x, y, j + k)
+            if x is None:
+                return None
+            if k == 1:
+                x, y = step(x, y, key, STEPS[1])
+            elif k == 3:
+                x, y = step(x, y, key, STEPS[2])
+        return x, y, j + MOVE_TICKS
+
+    def plan(self, session):
+        # (key, state after it) steps, key None to wait a tick, to the first
+        # home found; when the budget runs out first, to the highest point
+        # reached, the one alive the longest among equals. The last state of
+        # a path home is None
+        start = time.perf_counter()
+        # Session.countdown kills the frog on this tick
+        deadline = session.ticks_time + 31 * (session.game.time - 1)
+        horizon = max(min(self.horizon, deadline), 1)
+        forecast = Forecast(session, horizon, self.car_bounds,
+                            self.log_bounds)
+        homes = self.homes(session.chegaram)
+        frog = session.frog
+        x, y = frog.position
+        root = (x, y, 0)
+        parents = {root: None}
+        queue = [(self.heuristic(y), y, 0, root)]
+        best = root
+        found = None
+        nodes = 0
+        while queue:
+            f, row, j, node = heapq.heappop(queue)
+            nodes += 1
+            if nodes == self.max_nodes:
+                break
+            if (self.budget is not None and nodes % 64 == 0 and
+                    time.perf_counter() - start > self.budget):
+                break
+            x, y, j = node
+            if (y, -j) < (best[1], -best[2]):
+                best = node
+            if j + MOVE_TICKS >= horizon:
+                continue
+            for key in (None,) + KEYS:
+                if key is None:
+                    nx = forecast.update(x, y, j)
+                    child = None if nx is None else (nx, y, j + 1)
+                else:
+                    child = self.move(forecast, x, y, j, key, homes)
+                if child is None or child in parents:
+                    continue
+                if child == "home":
+                    found = (node, key)
+                    queue = []
+                    break
+                parents[child] = (node, key)
+                heapq.heappush(queue, (child[2] + self.heuristic(child[1]),
+                                       child[1], child[2], child))
+        steps = []
+        if found:
+            node, key = found
+            steps.append((key, None))
+        else:
+            node = best
+        while parents[node] is not None:
+            parent, key = parents[node]
+            steps.append((key, node))
+            node = parent
+        steps.reverse()
+        self.plans += 1
+        self.nodes += nodes
+        self.seconds += time.perf_counter() - start
+        return steps, found is not None
+
+    def report(self):
+        return {"plans": self.plans, "nodes": self.nodes,
+                "seconds": round(self.seconds, 4),
+                "nodes_per_second": round(self.nodes / self.seconds)
+                if self.seconds else 0}
@@ -0,0 +1,269 @@
+import random as Random
+import time
+
+from game.planner import FROG, MOVE_TICKS, Forecast, Planner
+
+HOMES = (43, 125, 207, 289, 371)
+
+
+class RandomPolicy():
+
+    def __init__(self, seed=None):
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        self.random = Random.Random(seed)
+
+    def __call__(self, sim):
+        return self.random.choice(sim.ACTIONS)
+
+
+class ScriptedPolicy():
+    # Looks a few ticks ahead with every car and log moving at its current
+    # velocity and presses the first key whose path stays safe.
+
+    HORIZON = 7
+
+    def __init__(self, seed=None):
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        pass
+
+    def __call__(self, sim):
+        return self.act(sim.session)
+
+    def act(self, session):
+        frog = session.frog
+        if frog.can_move != 1:
+            return None
+        x, y = frog.position
+        speed = session.game.speed
+        cars = [(e.position[0], e.position[1], e.sprite.get_width(),
+                 e.sprite.get_height(), speed * e.factor * direction(e.way))
+                for e in session.enemys]
+        logs = [(p.position[0], p.position[1], p.sprite.get_width(),
+                 p.sprite.get_height(), speed * direction(p.way))
+                for p in session.plataforms]
+
+        keys = ["up", None, "left", "right", "down"]
+        if y < 90:
+            home = min(HOMES, key=lambda h: abs(h - x))
+            if home - x > 10:
+                keys = ["right", None, "up", "left", "down"]
+            elif x - home > 10:
+                keys = ["left", None, "up", "right", "down"]
+        for key in keys:
+            if self.safe(x, y, key, cars, logs):
+                return key
+        return None
+
+    def safe(self, x, y, key, cars, logs):
+        dx, dy = {"up": (0, -13), "down": (0, 13), "left": (-14, 0),
+                  "right": (14, 0), None: (0, 0)}[key]
+        if ((key == "up" and y <= 39) or (key == "down" and y >= 473) or
+                (key == "left" and x <= 2) or (key == "right" and x >= 401)):
+            return False
+        for tick in range(self.HORIZON):
+            # the frog moves on the press and every second tick after it
+            if tick in (0, 2, 4):
+                x, y = x + dx, y + dy
+            if y > 240:
+                if hits(x, y, cars, tick):
+                    return False
+            elif 40 < y < 240:
+                log = hits(x, y, logs, tick)
+                if not log:
+                    return False
+                x += log[-1][4]
+        return True
+
+
+def direction(way):
+    return 1 if way == "right" else -1 if way == "left" else 0
+
+
+def hits(x, y, entities, tick):
+    found = []
+    for ex, ey, width, height, velocity in entities:
+        ex = ex + velocity * (tick + 1)
+        if ex < x + 30 and x < ex + width and ey < y + 30 and y < ey + height:
+            found.append((ex, ey, width, height, velocity))
+    return found
+
+
+class SearchPolicy():
+    # Follows a Planner path and plans again whenever the frog is not where
+    # the path said it would be or the path ran out. act() takes the
+    # session alone, for driving the windowed game, which passes its own
+    # (car, log) bounds instead of having the headless frogger imported.
+
+    def __init__(self, seed=None, budget=0.015, max_nodes=None,
+                 bounds=None):
+        if bounds is None:
+            from game.sim import frogger
+            bounds = (frogger.CAR_BOUNDS, frogger.LOG_BOUNDS)
+        self.planner = Planner(*bounds, budget=budget, max_nodes=max_nodes)
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        self.steps = []
+        self.start = None
+        self.expected = None
+        self.planner.resetCounters()
+
+    def __call__(self, sim):
+        return self.act(sim.session)
+
+    def act(self, session):
+        frog = session.frog
+        if frog.can_move != 1:
+            return None
+        if not self.onPath(session):
+            self.steps, found = self.planner.plan(session)
+            self.start = session.tick
+            if not found:
+                # only the first step of a partial path is worth taking
+                del self.steps[1:]
+        if not self.steps:
+            return None
+        key, self.expected = self.steps.pop(0)
+        return key
+
+    def onPath(self, session):
+        if not self.steps or self.start is None:
+            return False
+        x, y, j = self.expected
+        return (session.tick - self.start == j and
+                tuple(session.frog.position) == (x, y))
+
+    def report(self):
+        return self.planner.report()
+
+
+class TablePolicy():
+    # Plays the level's policytable, as solved by `python -m game.frogger
+    # policy`; levels without a table on disk are played by the search bot.
+    # Each key is pressed on a forecast of the real traffic (cars that
+    # changed lanes, or came in at an older speed, or a lane that has not
+    # filled up yet) and the table values the state it leads to at the
+    # lanes' phases in this game; the frog takes the cheapest key, waiting
+    # when every key dies. The table averages over how lanes of one period
+    # line up, which a game fixes: when the frog falls SLACK ticks behind
+    # what the table promised on a row, the search bot takes it the rest of
+    # the way. The table heads for any home, so once one is taken the
+    # search bot also takes the frog from row TOP to the free ones.
+
+    SLACK = 60
+    TOP = 85
+
+    def __init__(self, seed=None, cache_dir=None, bounds=None, budget=0.015,
+                 max_nodes=None):
+        # numpy stays optional for the other policies
+        from game import policytable
+        self.policytable = policytable
+        if bounds is None:
+            from game.sim import frogger
+            bounds = (frogger.CAR_BOUNDS, frogger.LOG_BOUNDS)
+        self.bounds = bounds
+        self.cache_dir = cache_dir
+        self.checker = Planner(*bounds)
+        self.search = SearchPolicy(budget=budget, max_nodes=max_nodes,
+                                   bounds=bounds)
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        self.tables = {}
+        self.residues = None
+        self.frog = None
+        self.lost = False
+        self.row = None
+        self.promise = None
+        self.lookups = 0
+        self.searches = 0
+        self.seconds = 0.0
+        self.search.reset(seed)
+
+    def table(self, session):
+        # None when the level's table was never solved; the game's spawn
+        # residues are kept for the lookups
+        cars, logs = self.policytable.sessionSpecs(session, *self.bounds)
+        self.residues = [spec.residue for spec in cars + logs]
+        key = tuple(spec.key()[:-1] for spec in cars + logs)
+        if key not in self.tables:
+            self.tables[key] = self.policytable.load(
+                self.policytable.Layout(cars, logs), self.cache_dir)
+        return self.tables[key]
+
+    def __call__(self, sim):
+        return self.act(sim.session)
+
+    def act(self, session):
+        if session.frog.can_move != 1:
+            return None
+        table = self.table(session)
+        # a frog lasts until it dies or gets home
+        frog = (session.game.level, session.frog.lives, len(session.chegaram))
+        if frog != self.frog:
+            self.frog, self.lost = frog, False
+        y = session.frog.position[1]
+        if y != self.row:
+            self.row, self.promise = y, None
+        if (table is None or self.lost or
+                (session.chegaram and y <= self.TOP)):
+            self.searches += 1
+            return self.search.act(session)
+        start = time.perf_counter()
+        key, cost = self.lookup(session, table)
+        self.lookups += 1
+        self.seconds += time.perf_counter() - start
+        if cost < self.policytable.DEATH:
+            due = session.tick + cost
+            if self.promise is None:
+                self.promise = due
+            elif due > self.promise + self.SLACK:
+                self.lost = True
+                return self.act(session)
+        return key
+
+    def lookup(self, session, table):
+        # the cheapest key and its cost
+        x, y = session.frog.position
+        # a press reaches the row above at most
+        forecast = Forecast(session, MOVE_TICKS, *self.bounds,
+                            rows=(y - 39, y + FROG))
+        homes = self.checker.homes(session.chegaram)
+        best, found = self.policytable.DEATH, None
+        for key in self.policytable.KEYS:
+            cost = self.cost(forecast, table, session.car_spawner.now, x, y,
+                             key, homes)
+            if cost < best:
+                best, found = cost, key
+        return found, best
+
+    def cost(self, forecast, table, tick, x, y, key, homes):
+        # ticks to a home after pressing `key`, DEATH when it dies
+        if key is None:
+            x = forecast.update(x, y, 0)
+            state = None if x is None else (x, y, 1)
+        else:
+            state = self.checker.move(forecast, x, y, 0, key, homes)
+        if state is None or state == "home":
+            return 1 if state else self.policytable.DEATH
+        x, y, j = state
+        value = table.lookup(x, y, tick + j, self.residues)
+        return self.policytable.DEATH if value is None else j + value
+
+    def report(self):
+        return {"lookups": self.lookups, "searches": self.searches,
+                "seconds": round(self.seconds, 4),
+                "lookups_per_second": round(self.lookups / self.seconds)
+                if self.seconds else 0}
+
+
+POLICIES = {
+    "random": RandomPolicy,
+    "scripted": ScriptedPolicy,
+    "search": SearchPolicy,
+    "table": TablePolicy,
+}
@@ -0,0 +1,406 @@
+import argparse
+import hashlib
+import json
+import math
+import os
+import time
+
+import numpy as np
+
+from game.hazards import laneSpecs
+from game.planner import HOMES, STEPS
+
+VERSION = 3
+# the rows the frog takes keys on: every press moves it 39 px
+DECISION_ROWS = tuple(range(475, 40, -39))
+# a press moves the frog 41 px sideways, so on the street, where nothing
+# carries it, x stays on this grid
+STREET_XS = np.arange(2, 413, 41)
+# how far a log can carry the frog before it sinks with it
+XMIN = -140
+XMAX = 560
+RIVER_XS = np.arange(XMIN, XMAX + 1)
+# the keys a lookup weighs, in the order ties are broken
+KEYS = ("up", "left", "right", None)
+FROG = 30
+# a death costs as much as this many ticks
+DEATH = 1000.0
+# states of a row solved at a time, to bound the [state, x, spawn] arrays
+BLOCK = 1024
+MAX_ROUNDS = 200
+
+
+def cacheDir():
+    return os.environ.get('FROGGER_POLICY_DIR',
+                          os.path.join(os.path.expanduser('~'), '.cache',
+                                       'frogger'))
+
+
+# Cars or logs of one lane as a function of its phase: on the tick of phase
+# q the spawns of age q + 1, q + 1 + period, ... are out, as in
+# hazards.laneTimeline.
+class Lane():
+
+    def __init__(self, spec, street):
+        self.spec = spec
+        self.street = street
+        self.v = spec.v
+        self.period = period = spec.period
+        life = spec.life if spec.life is not None else 0
+        count = max((life + 1) // period + 1, 1)
+        self.ages = np.arange(period)[:, None] + 1 + \
+            period * np.arange(count)
+        self.alive = self.ages <= life + 1
+        self.xs = spec.x + spec.v * self.ages
+
+    def over(self, q, x):
+        # [..., spawn] spawns touching a frog at x on phase q
+        xs = self.xs[q]
+        return self.alive[q] & (xs < x[..., None] + FROG) & \
+            (x[..., None] < xs + self.spec.width)
+
+    def youngest(self, q, x):
+        # age of the youngest spawn under the frog, 0 for none: it is the
+        # lane's last one in the entity list
+        found = self.over(q, x)
+        ages = np.where(found, self.ages[q], np.iinfo(self.ages.dtype).max)
+        return np.where(found.any(axis=-1), ages.min(axis=-1), 0)
+
+
+# The rows and table geometry of one level's lanes. The state of row d is
+# (phase of the lane under the row, phase of the lane above it, x): the two
+# lanes an up press meets, so both are known exactly. The phases come from
+# the tick and each lane's spawn residue, which depends on when the game
+# reached the level, so the residues are left out of the key and one table
+# serves every game on the level. x takes the street grid or every pixel
+# on the river.
+class Layout():
+
+    def __init__(self, cars, logs):
+        self.key = hashlib.sha1(repr((
+            VERSION, DEATH, XMIN, XMAX,
+            [spec.key()[:-1] for spec in cars + logs])).encode()
+        ).hexdigest()[:16]
+        self.cars = [Lane(spec, True) for spec in cars]
+        self.logs = [Lane(spec, False) for spec in logs]
+        self.lanes = self.cars + self.logs
+        lanes = [self.laneAt(y) for y in DECISION_ROWS] + [None]
+        self.rows = []
+        offset = 0
+        for d, y in enumerate(DECISION_ROWS):
+            band = (lanes[d], lanes[d + 1])
+            for passing in (y - 13, y - 26):
+                if any(lane not in band for lane in self.lanesAt(passing)):
+                    raise ValueError("row %d is under a third lane" %
+                                     passing)
+            periods = tuple(1 if lane is None else lane.period
+                            for lane in band)
+            states = np.arange(periods[0] * periods[1])
+            order = np.empty(periods, np.int64)
+            order[split(periods, states)] = states
+            xs = STREET_XS if y > 240 else RIVER_XS
+            self.rows.append((y, band, periods, xs, offset, order))
+            offset += len(states) * len(xs)
+        self.size = offset
+
+    def lanesAt(self, y):
+        lanes = self.cars if y > 240 else self.logs
+        return [lane for lane in lanes
+                if y < lane.spec.y + lane.spec.height and
+                y + FROG > lane.spec.y]
+
+    def laneAt(self, y):
+        lanes = self.lanesAt(y)
+        if len(lanes) > 1:
+            raise ValueError("row %d is under more than one lane" % y)
+        return lanes[0] if lanes else None
+
+    def column(self, d, x):
+        # x's column in row d, -1 when off the row's grid
+        xs = self.rows[d][3]
+        col = np.asarray(x) - xs[0]
+        if xs is STREET_XS:
+            on = (col % 41 == 0) & (col >= 0) & (col < 41 * len(xs))
+            col = np.where(on, col // 41, -1)
+        else:
+            col = np.where((col >= 0) & (col < len(xs)), col, -1)
+        return col.astype(np.int32)
+
+    def index(self, d, phases, x):
+        # column() for one x, in plain ints
+        y, band, periods, xs, offset, order = self.rows[d]
+        col = x - int(xs[0])
+        if xs is STREET_XS:
+            if col % 41:
+                return None
+            col //= 41
+        if not 0 <= col < len(xs):
+            return None
+        return offset + int(order[phases]) * len(xs) + col
+
+    def at(self, d, tick, residues):
+        # row d's phases on `tick`, from the lanes' residues in self.lanes
+        # order
+        return tuple(0 if lane is None else
+                     (tick - residues[self.lanes.index(lane)]) % lane.period
+                     for lane in self.rows[d][1])
+
+    def phases(self, d, states):
+        # phases(k): the band's lane phases k ticks after `states`
+        band, periods = self.rows[d][1:3]
+        start = split(periods, states)
+
+        def at(k):
+            return {lane: (q + k) % lane.period
+                    for lane, q in zip(band, start) if lane is not None}
+        return at
+
+    def collide(self, y, x, phases):
+        # Session.collide on row y: whether the frog lives and where a log
+        # takes it
+        lanes = self.lanesAt(y)
+        if y > 240:
+            alive = np.ones(x.shape, bool)
+            for lane in lanes:
+                alive &= ~lane.over(phases[lane], x).any(axis=-1)
+            return alive, x
+        best = np.zeros(x.shape, np.int64)
+        v = np.zeros(x.shape, np.int64)
+        for lane in lanes:
+            ages = lane.youngest(phases[lane], x)
+            take = (ages > 0) & ((best == 0) | (ages < best))
+            best = np.where(take, ages, best)
+            v = np.where(take, lane.v, v)
+        return best > 0, x + v
+
+    def press(self, x, y, key, phases):
+        # the four ticks of a key press from (x, y): alive and the x and y
+        # of the next press; y < 40 when the frog got home
+        alive = np.ones(x.shape, bool)
+        x, y = step(x, y, key, STEPS[0])
+        for k in range(4):
+            if y < 40:
+                home = np.zeros(x.shape, bool)
+                for left, right in HOMES:
+                    home |= (left < x) & (x < right)
+                return alive & home, x, y
+            ok, x = self.collide(y, x, phases(k))
+            alive &= ok
+            if k == 1:
+                x, y = step(x, y, key, STEPS[1])
+            elif k == 3:
+                x, y = step(x, y, key, STEPS[2])
+        return alive, x, y
+
+
+def split(periods, states):
+    # state j of a row is tick t of orbit r, where the lanes' phases are t
+    # and t + r: waiting walks an orbit, and the gcd of the periods orbits
+    # cover every pair of phases
+    length = periods[0] * periods[1] // math.gcd(*periods)
+    orbit, tick = np.divmod(states, length)
+    return tick % periods[0], (tick + orbit) % periods[1]
+
+
+def later(periods, states, ticks):
+    length = periods[0] * periods[1] // math.gcd(*periods)
+    return states - states % length + (states % length + ticks) % length
+
+
+def step(x, y, key, size):
+    # planner.step over an array of x
+    if key == "up":
+        if y > 39:
+            y -= 13
+    elif key == "down":
+        if y < 473:
+            y += 13
+    elif key == "left":
+        x = np.where(x > 2, x - size, x)
+    elif key == "right":
+        x = np.where(x < 401, x + size, x)
+    return x, y
+
+
+# Value iteration for the expected ticks to a home, a death counting DEATH
+# ticks. A row's band holds the lanes an up press meets, so only the lane
+# above the landing row is unknown: its phase is taken as uniform. In play
+# that phase is known, which is why the table keeps the values and the
+# lookup weighs the keys on them. With no down key each row is solved once,
+# from the homes down: the waits settle in passes around the row's orbits
+# and the sideways presses by repeating those.
+def solve(layout):
+    values = np.zeros(layout.size, np.float16)
+    landing = None
+    for d in reversed(range(len(layout.rows))):
+        y, band, periods, xs, offset, order = layout.rows[d]
+        size = periods[0] * periods[1]
+        parts = [transitions(layout, d, j) for j in blocks(size)]
+        wait, left, right, up = [tuple(np.concatenate(a) for a in zip(*m))
+                                 for m in zip(*parts)]
+        if landing is None:
+            fixed = np.where(up[0], np.float32(1), np.float32(DEATH))
+        else:
+            fixed = arrive(landing, up)
+        value = np.full((size, len(xs)), DEATH, np.float32)
+        for rounds in range(MAX_ROUNDS):
+            sides = np.minimum(take(value, left, 4), take(value, right, 4))
+            settled = settle(np.minimum(fixed, sides), wait)
+            if np.array_equal(settled, value):
+                break
+            value = settled
+        values[offset:offset + value.size] = value.ravel()
+        # what landing on this row is worth to the row below, which knows
+        # the phase of the lane under it: [phase, x]
+        landing = value[order].mean(axis=1)
+    return values
+
+
+def blocks(size):
+    return [np.arange(start, min(start + BLOCK, size))[:, None]
+            for start in range(0, size, BLOCK)]
+
+
+def transitions(layout, d, j):
+    # (alive, next state, next column) of waiting, left, right and up from
+    # states j; up's state is the phase of the lane under the row above and
+    # its column is in that row
+    y, band, periods, xs, offset, order = layout.rows[d]
+    x = np.broadcast_to(xs, (len(j), len(xs)))
+    phases = layout.phases(d, j)
+    found = []
+    alive, wx = layout.collide(y, x, phases(0))
+    found.append((alive, np.broadcast_to(later(periods, j, 1), x.shape),
+                  layout.column(d, np.broadcast_to(wx, x.shape))))
+    for key in ("left", "right"):
+        alive, kx, ky = layout.press(x, y, key, phases)
+        found.append((alive, np.broadcast_to(later(periods, j, 4), x.shape),
+                      layout.column(d, kx)))
+    alive, ux, uy = layout.press(x, y, "up", phases)
+    column = layout.column(d + 1, ux) if uy >= 40 else \
+        np.zeros(x.shape, np.int32)
+    landing = (split(periods, j)[1] + 4) % periods[1]
+    found.append((alive, np.broadcast_to(landing, x.shape), column))
+    return found
+
+
+def take(value, move, cost):
+    alive, tick, col = move
+    found = value[tick, np.maximum(col, 0)]
+    return np.where(alive & (col >= 0), cost + found, np.float32(DEATH))
+
+
+def arrive(landing, up):
+    alive, phase, col = up
+    found = landing[phase, np.maximum(col, 0)]
+    ok = alive & (col >= 0) & (found < DEATH)
+    return np.where(ok, 4 + found, np.float32(DEATH)).astype(np.float32)
+
+
+def settle(exits, wait):
+    # value[j] = min(exits[j], 1 + value[next j] after the wait), twice
+    # down the states so the waits that wrap around an orbit settle too
+    alive, following, col = wait
+    following = following[:, 0]
+    value = np.minimum(exits, np.float32(DEATH))
+    ok = alive & (col >= 0)
+    col = np.maximum(col, 0)
+    for j in list(range(len(exits) - 1, -1, -1)) * 2:
+        waited = np.where(ok[j], 1 + value[following[j]][col[j]],
+                          np.float32(DEATH))
+        np.minimum(value[j], waited, out=value[j])
+    return value
+
+
+# A solved Layout on disk: one float16 value per state, read through a
+# memory map on the first lookup, so every process playing the level
+# shares one copy.
+class PolicyTable():
+
+    def __init__(self, layout, path):
+        self.layout = layout
+        self.path = path
+        self.values = None
+
+    def value(self, d, phases, x):
+        # expected ticks to a home from row d on its lanes' phases, DEATH
+        # off the table
+        if self.values is None:
+            self.values = np.load(self.path, mmap_mode='r')
+        index = self.layout.index(d, phases, x)
+        if index is None:
+            return DEATH
+        return float(self.values[index])
+
+    def lookup(self, x, y, tick, residues):
+        # value of the frog at (x, y) on the spawners' `tick`, the lanes
+        # spawning on `residues`; None off the rows the frog takes keys on
+        if y not in DECISION_ROWS:
+            return None
+        d = DECISION_ROWS.index(y)
+        return self.value(d, self.layout.at(d, tick, residues), x)
+
+
+def tablePath(layout, directory=None):
+    return os.path.join(directory or cacheDir(),
+                        'policy-%s.npy' % layout.key)
+
+
+def load(layout, directory=None):
+    # the table of `layout` on disk, None when it was never solved
+    path = tablePath(layout, directory)
+    if not os.path.exists(path):
+        return None
+    return PolicyTable(layout, path)
+
+
+def save(layout, directory=None):
+    # solves `layout` and writes its table where load() finds it
+    path = tablePath(layout, directory)
+    values = solve(layout)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # other processes may be solving the same level
+    partial = '%s.%d.tmp' % (path, os.getpid())
+    with open(partial, 'wb') as f:
+        np.save(f, values)
+    os.replace(partial, path)
+    return PolicyTable(layout, path)
+
+
+def sessionSpecs(session, car_bounds, log_bounds):
+    # residues in the spawners' ticks, the same in every session that
+    # reached the level the same way
+    cars = laneSpecs(session.car_spawner, session.game, car_bounds)
+    logs = laneSpecs(session.log_spawner, session.game, log_bounds)
+    return cars, logs
+
+
+def sessionLayout(session, car_bounds, log_bounds):
+    return Layout(*sessionSpecs(session, car_bounds, log_bounds))
+
+
+def main(argv=None):
+    # python -m game.frogger policy: solves the tables of levels 1..N
+    from game.sim import frogger
+    parser = argparse.ArgumentParser(prog='python -m game.frogger policy')
+    parser.add_argument('--levels', type=int, default=1,
+                        help='solve levels 1..N')
+    parser.add_argument('--cache-dir')
+    args = parser.parse_args(argv)
+    report = []
+    for level in range(1, args.levels + 1):
+        # the speed a game has on the level; the residues the session
+        # starts with do not matter
+        session = frogger.Session(frogger.Game(2 + level, level), seed=0)
+        layout = sessionLayout(session, frogger.CAR_BOUNDS,
+                               frogger.LOG_BOUNDS)
+        start = time.perf_counter()
+        table = load(layout, args.cache_dir)
+        solved = table is None
+        if solved:
+            table = save(layout, args.cache_dir)
+        report.append({"level": level, "states": layout.size,
+                       "path": table.path, "solved": solved,
+                       "seconds": round(time.perf_counter() - start, 3)})
+    print(json.dumps(report, indent=2))
+    return report
@@ -0,0 +1,36 @@
+# Free list of one entity class. Despawned entities are released here and
+# handed out again by acquire(), which resets them in place (position list
+# included) instead of building a new object, so once the pool has grown
+# to the most entities alive at once the game stops allocating them.
+class Pool():
+
+    def __init__(self, cls):
+        self.cls = cls
+        self.free = []
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.free)
+
+    def acquire(self, x, y, *args):
+        if self.free:
+            self.hits += 1
+            entity = self.free.pop()
+            entity.reset(x, y, *args)
+            return entity
+        self.misses += 1
+        return self.cls([x, y], *args)
+
+    def release(self, entity):
+        self.free.append(entity)
+
+    def report(self):
+        return {"hits": self.hits, "misses": self.misses,
+                "free": len(self.free)}
+
+
+def spawn(pool, cls, x, y, *args):
+    if pool is None:
+        return cls([x, y], *args)
+    return pool.acquire(x, y, *args)
@@ -0,0 +1,136 @@
+import csv
+import json
+import time
+
+import pygame
+from pygame.locals import SRCALPHA
+
+PHASES = ("events", "spawn", "move", "collide", "other", "draw", "display",
+          "wait")
+COLORS = {
+    "events": (200, 200, 200),
+    "spawn": (255, 200, 0),
+    "move": (0, 200, 255),
+    "collide": (255, 60, 60),
+    "other": (160, 120, 255),
+    "draw": (0, 230, 90),
+    "display": (255, 140, 200),
+    "wait": (70, 70, 70),
+}
+# session methods timed on their own; the rest of update() is "other"
+NESTED = ("spawn", "move", "collide")
+
+
+# Splits every frame of the game loop into phases and keeps the last `size`
+# frames in a ring buffer. main() calls lap() after each part of the loop
+# and endFrame() once the clock has waited.
+class FrameProfiler():
+
+    def __init__(self, size=300, clock=time.perf_counter):
+        self.size = size
+        self.clock = clock
+        self.frames = [None] * size
+        self.next = 0
+        self.count = 0
+        self.total = 0
+        self.visible = False
+        self.font = None
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.nested = 0.0
+        self.mark = clock()
+
+    def __len__(self):
+        return self.count
+
+    def start(self):
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.nested = 0.0
+        self.mark = self.clock()
+
+    def attach(self, session):
+        for phase in NESTED:
+            setattr(session, phase, self.timed(phase, getattr(session, phase)))
+
+    def timed(self, phase, function):
+        def wrapper():
+            start = self.clock()
+            function()
+            elapsed = self.clock() - start
+            self.current[phase] += elapsed
+            self.nested += elapsed
+        return wrapper
+
+    def lap(self, phase):
+        now = self.clock()
+        self.current[phase] += now - self.mark - self.nested
+        self.nested = 0.0
+        self.mark = now
+
+    def endFrame(self):
+        self.frames[self.next] = tuple(self.current[phase] for phase in PHASES)
+        self.next = (self.next + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+        self.total += 1
+        self.current = dict.fromkeys(PHASES, 0.0)
+
+    def history(self):
+        start = (self.next - self.count) % self.size
+        return [self.frames[(start + k) % self.size]
+                for k in range(self.count)]
+
+    def means(self):
+        frames = self.history()
+        if not frames:
+            return dict.fromkeys(PHASES, 0.0)
+        return {phase: sum(frame[i] for frame in frames) / len(frames)
+                for i, phase in enumerate(PHASES)}
+
+    def toggle(self):
+        self.visible = not self.visible
+
+    def export(self, path):
+        first = self.total - self.count
+        rows = [[first + k] + [round(t * 1000, 4) for t in frame]
+                for k, frame in enumerate(self.history())]
+        with open(path, 'w', newline='') as output:
+            if path.endswith('.json'):
+                json.dump([dict(zip(("frame",) + PHASES, row))
+                           for row in rows], output)
+            else:
+                writer = csv.writer(output)
+                writer.writerow(("frame",) + PHASES)
+                writer.writerows(rows)
+        return path
+
+    def exportAll(self, prefix='profile'):
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        return [self.export('{0}-{1}.{2}'.format(prefix, stamp, extension))
+                for extension in ('csv', 'json')]
+
+    def render(self, width=160, height=60, scale=1.5):
+        # stacked bar per frame, newest on the right, 1.5 px per ms
+        if self.font is None:
+            self.font = pygame.font.Font(None, 16)
+        line = self.font.get_linesize()
+        surface = pygame.Surface((width + 70, max(height, line * len(PHASES))),
+                                 SRCALPHA)
+        surface.fill((0, 0, 0, 170))
+        frames = self.history()[-width:]
+        for x, frame in enumerate(frames, width - len(frames)):
+            bottom = height
+            for phase, seconds in zip(PHASES, frame):
+                size = seconds * 1000 * scale
+                if size >= 0.5:
+                    rect = (x, round(bottom - size), 1, max(1, round(size)))
+                    surface.fill(COLORS[phase], rect)
+                bottom -= size
+        budget = height - round(1000 / 30 * scale)
+        surface.fill((255, 255, 255), (0, budget, width, 1))
+        for i, (phase, seconds) in enumerate(self.means().items()):
+            text = '{0} {1:.2f}'.format(phase, seconds * 1000)
+            surface.blit(self.font.render(text, 1, COLORS[phase]),
+                         (width + 4, i * line))
+        return surface
+
+    def drawItem(self, position=(4, 4)):
+        return ("profiler", self.render(), position, None)
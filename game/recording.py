@@ -0,0 +1,313 @@
+import argparse
+import bisect
+import json
+import struct
+import sys
+import time
+
+from game.rng import MASK, SessionRandom
+
+MAGIC = b'FRGR'
+VERSION = 1
+HEADER = struct.Struct('<4sBQI')      # magic, version, seed, interval
+MOVE = struct.Struct('<BIB')          # tag, tick, key code
+KEYFRAME = struct.Struct('<BII')      # tag, tick, payload size
+END = struct.Struct('<BI')            # tag, last tick
+# S keyframes start a game (the state jumps there), K ones are periodic
+MOVE_TAG, START_TAG, KEYFRAME_TAG, END_TAG = b'MSKE'
+
+# key code 0 is followed by the key name, for keys other than the arrows
+KEYS = ("", "up", "down", "left", "right")
+CODES = {key: code for code, key in enumerate(KEYS) if key}
+
+# (sprite name in frogger, way, factor)
+CAR_TYPES = (
+    ("sprite_car1", "right", 1),
+    ("sprite_car2", "left", 2),
+    ("sprite_car3", "right", 2),
+    ("sprite_car4", "left", 1),
+    ("sprite_car5", "right", 1),
+)
+LOG_WAYS = ("right", "left")
+
+SESSION = struct.Struct('<Ii5d5d3I2Q4i')
+FROG = struct.Struct('<5iB')
+ENTITY = struct.Struct('<Bii')
+POINT = struct.Struct('<ii')
+COUNT = struct.Struct('<I')
+
+
+def packText(text):
+    data = text.encode()
+    return bytes((len(data),)) + data
+
+
+def unpackText(data, offset):
+    size = data[offset]
+    return data[offset + 1:offset + 1 + size].decode(), offset + 1 + size
+
+
+def gameModule(session):
+    # the frogger module that made the session: run as a script it is
+    # __main__, a copy of game.frogger with sprites of its own
+    return sys.modules[type(session.frog).__module__]
+
+
+def carCodes(module):
+    # by size, way and factor, the same in every copy of the module
+    return {(getattr(module, name).get_size(), way, factor): code
+            for code, (name, way, factor) in enumerate(CAR_TYPES)}
+
+
+def sheetWay(frog, module):
+    for way, sheet in module.frog_sprites.sheets.items():
+        if sheet is frog.sprite:
+            return way
+    return "up"
+
+
+def snapshot(session):
+    # everything update() reads, so a session restored from it plays on
+    # exactly like the one that was recorded
+    game = session.game
+    frog = session.frog
+    module = gameModule(session)
+    codes = carCodes(module)
+    parts = [SESSION.pack(
+        session.tick, session.ticks_time, *session.ticks_enemys,
+        *session.ticks_plataforms, session.deaths["car"],
+        session.deaths["water"], session.deaths["time"],
+        *session.rng.getstate(), game.speed, game.level, game.points,
+        game.time)]
+    parts.append(packText(session.key_pressed or ""))
+    parts.append(FROG.pack(frog.position[0], frog.position[1], frog.lives,
+                           frog.animation_tick, frog.animation_counter,
+                           frog.can_move))
+    parts.append(packText(frog.way))
+    parts.append(packText(sheetWay(frog, module)))
+    parts.append(COUNT.pack(len(session.enemys)))
+    for enemy in session.enemys:
+        code = codes[(enemy.sprite.get_size(), enemy.way, enemy.factor)]
+        parts.append(ENTITY.pack(code, *enemy.position))
+    parts.append(COUNT.pack(len(session.plataforms)))
+    for plataform in session.plataforms:
+        parts.append(ENTITY.pack(LOG_WAYS.index(plataform.way),
+                                 *plataform.position))
+    parts.append(COUNT.pack(len(session.chegaram)))
+    for arrived in session.chegaram:
+        parts.append(POINT.pack(*arrived.position))
+    return b''.join(parts)
+
+
+def restore(data, seed):
+    from game import frogger
+    values = SESSION.unpack_from(data)
+    offset = SESSION.size
+    (tick, ticks_time), values = values[:2], values[2:]
+    ticks_enemys, values = list(values[:5]), values[5:]
+    ticks_plataforms, values = list(values[:5]), values[5:]
+    deaths, values = values[:3], values[3:]
+    counters, values = values[:2], values[2:]
+    speed, level, points, game_time = values
+
+    game = frogger.Game(speed, level)
+    game.points = points
+    game.time = game_time
+    rng = SessionRandom(seed)
+    rng.setstate(counters)
+    session = frogger.Session(game, rng=rng)
+    session.tick = tick
+    session.ticks_time = ticks_time
+    session.ticks_enemys = ticks_enemys
+    session.ticks_plataforms = ticks_plataforms
+    session.deaths = dict(zip(("car", "water", "time"), deaths))
+    key_pressed, offset = unpackText(data, offset)
+    session.key_pressed = key_pressed or 0
+
+    x, y, lives, animation_tick, animation_counter, can_move = \
+        FROG.unpack_from(data, offset)
+    offset += FROG.size
+    frog = session.frog
+    frog.position = [x, y]
+    frog.lives = lives
+    frog.animation_tick = animation_tick
+    frog.animation_counter = animation_counter
+    frog.can_move = can_move
+    frog.way, offset = unpackText(data, offset)
+    sheet, offset = unpackText(data, offset)
+    frog.sprite = frogger.frog_sprites.sheets[sheet]
+    frog.frames = frogger.frog_sprites.frames[sheet]
+
+    count, = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    for _ in range(count):
+        code, x, y = ENTITY.unpack_from(data, offset)
+        offset += ENTITY.size
+        name, way, factor = CAR_TYPES[code]
+        session.enemys.append(frogger.Enemy([x, y], getattr(frogger, name),
+                                            way, factor))
+    count, = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    for _ in range(count):
+        code, x, y = ENTITY.unpack_from(data, offset)
+        offset += ENTITY.size
+        session.plataforms.append(frogger.Plataform(
+            [x, y], frogger.sprite_plataform, LOG_WAYS[code]))
+    count, = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    for _ in range(count):
+        session.chegaram.append(frogger.Object(
+            list(POINT.unpack_from(data, offset)), frogger.sprite_arrived))
+        offset += POINT.size
+    return session
+
+
+# Writes the accepted moves of a session, a keyframe every `interval` ticks
+# and one whenever attach() is called (main() calls it after newFrog).
+class Recorder():
+
+    def __init__(self, path, seed, interval=300):
+        self.file = open(path, 'wb')
+        self.interval = interval
+        self.session = None
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed & MASK, interval))
+
+    def attach(self, session):
+        if self.session is not session:
+            self.session = session
+            press = session.pressKey
+            update = session.update
+
+            def pressKey(key):
+                accepted = press(key)
+                if accepted:
+                    self.move(session.tick, key)
+                return accepted
+
+            def step():
+                update()
+                if session.tick % self.interval == 0:
+                    self.keyframe(session)
+
+            session.pressKey = pressKey
+            session.update = step
+        self.keyframe(session, START_TAG)
+
+    def move(self, tick, key):
+        code = CODES.get(key, 0)
+        self.file.write(MOVE.pack(MOVE_TAG, tick, code))
+        if not code:
+            self.file.write(packText(key))
+
+    def keyframe(self, session, tag=KEYFRAME_TAG):
+        payload = snapshot(session)
+        self.file.write(KEYFRAME.pack(tag, session.tick, len(payload)))
+        self.file.write(payload)
+
+    def close(self):
+        if self.file.closed:
+            return
+        tick = self.session.tick if self.session else 0
+        self.file.write(END.pack(END_TAG, tick))
+        self.file.close()
+
+
+class Replay():
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        magic, version, self.seed, self.interval = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('{0} is not a frogger recording'.format(path))
+        # events in file order: (tick, kind, value)
+        self.events = []
+        self.keyframes = []
+        self.end = 0
+        offset = HEADER.size
+        while offset < len(data):
+            tag = data[offset]
+            if tag == MOVE_TAG:
+                _, tick, code = MOVE.unpack_from(data, offset)
+                offset += MOVE.size
+                key = KEYS[code]
+                if not code:
+                    key, offset = unpackText(data, offset)
+                self.events.append((tick, "move", key))
+            elif tag in (START_TAG, KEYFRAME_TAG):
+                _, tick, size = KEYFRAME.unpack_from(data, offset)
+                offset += KEYFRAME.size
+                self.keyframes.append((tick, len(self.events)))
+                kind = "start" if tag == START_TAG else "keyframe"
+                self.events.append((tick, kind, data[offset:offset + size]))
+                offset += size
+            elif tag == END_TAG:
+                _, tick = END.unpack_from(data, offset)
+                offset += END.size
+            else:
+                raise ValueError('bad record at byte {0}'.format(offset))
+            self.end = max(self.end, tick)
+        if not self.keyframes:
+            raise ValueError('{0} has no keyframe'.format(path))
+
+    def __len__(self):
+        return self.end
+
+    def moves(self):
+        return [(tick, key) for tick, kind, key in self.events
+                if kind == "move"]
+
+    def seek(self, tick):
+        # restore the last keyframe at or before `tick` and play forward;
+        # the session is returned at the start of `tick`, before its moves
+        ticks = [keyframe for keyframe, index in self.keyframes]
+        start = max(bisect.bisect_right(ticks, tick) - 1, 0)
+        return self.play(self.keyframes[start][1], tick)
+
+    def play(self, index, until):
+        session = None
+        for tick, kind, value in self.events[index:]:
+            if tick > until or (tick == until and kind == "move"):
+                break
+            if session is not None and session.tick < tick:
+                session.advance(tick - session.tick)
+            if kind == "move":
+                session.pressKey(value)
+            elif kind == "start" or session is None:
+                session = restore(value, self.seed)
+        session.advance(until - session.tick)
+        return session
+
+    def run(self):
+        # simulates every tick; periodic keyframes are only for seeking
+        return self.play(0, self.end)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m game.frogger replay')
+    parser.add_argument('path')
+    parser.add_argument('--seek', type=int,
+                        help='stop at this tick (default: the end)')
+    args = parser.parse_args(argv)
+
+    replay = Replay(args.path)
+    start = time.perf_counter()
+    if args.seek is None:
+        session = replay.run()
+    else:
+        session = replay.seek(args.seek)
+    elapsed = time.perf_counter() - start
+    summary = {
+        "seed": replay.seed,
+        "tick": session.tick,
+        "moves": len(replay.moves()),
+        "keyframes": len(replay.keyframes),
+        "points": session.game.points,
+        "level": session.game.level,
+        "lives": session.frog.lives,
+        "seconds": round(elapsed, 4),
+        # the game runs at 30 ticks per second
+        "speedup": round(session.tick / 30 / elapsed) if elapsed else None,
+    }
+    print(json.dumps(summary, indent=2))
+    return summary
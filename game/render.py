@@ -0,0 +1,120 @@
+from pygame import Rect
+
+
+def mergeRects(rects):
+    merged = []
+    for rect in rects:
+        rect = Rect(rect)
+        i = rect.collidelist(merged)
+        while i != -1:
+            rect.union_ip(merged.pop(i))
+            i = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+# Redraws only what changed: the background is restored under the old and
+# new rects of everything that moved, appeared or vanished, items touching
+# those areas are blitted again in draw order, and only those areas are
+# handed to pygame.display.update.
+class DirtyRenderer():
+
+    def __init__(self, screen, background):
+        self.screen = screen
+        self.background = background
+        self.bounds = screen.get_rect()
+        self.previous = {}
+        self.frames = 0
+        self.pixels = 0
+        self.last_pixels = 0
+        self.invalidate()
+
+    def invalidate(self):
+        self.full = True
+
+    def itemRect(self, surface, position, area):
+        if area is None:
+            size = surface.get_size()
+        else:
+            size = area.clip(surface.get_rect()).size
+        return Rect((int(position[0]), int(position[1])), size)
+
+    def draw(self, items):
+        screen = self.screen
+        current = {}
+        drawn = []
+        for key, surface, position, area in items:
+            rect = self.itemRect(surface, position, area)
+            current[key] = (rect, id(surface), area)
+            drawn.append((key, surface, rect, area))
+
+        if self.full:
+            self.full = False
+            screen.blit(self.background, (0, 0))
+            for key, surface, rect, area in drawn:
+                screen.blit(surface, rect, area)
+            dirty = [self.bounds]
+        else:
+            changed = []
+            for key, (rect, surface_id, area) in self.previous.items():
+                if current.get(key) != (rect, surface_id, area):
+                    changed.append(rect)
+            for key, surface, rect, area in drawn:
+                if self.previous.get(key) != current[key]:
+                    changed.append(rect)
+            dirty = [rect.clip(self.bounds) for rect in changed]
+            dirty = mergeRects([rect for rect in dirty if rect.w and rect.h])
+            # clipping keeps translucent edges from being blended twice
+            for clip in dirty:
+                screen.set_clip(clip)
+                screen.blit(self.background, clip, clip)
+                for key, surface, rect, area in drawn:
+                    if rect.colliderect(clip):
+                        screen.blit(surface, rect, area)
+            screen.set_clip(None)
+
+        self.previous = current
+        self.frames += 1
+        self.last_pixels = sum(rect.w * rect.h for rect in dirty)
+        self.pixels += self.last_pixels
+        return dirty
+
+    def report(self):
+        full = self.bounds.w * self.bounds.h
+        mean = self.pixels / self.frames if self.frames else 0
+        return {
+            "frames": self.frames,
+            "pixels_per_frame": round(mean),
+            "full_frame_pixels": full,
+            "ratio": round(mean / full, 4) if full else 0,
+        }
+
+
+# Draws entities between their positions at the last two ticks so the
+# screen can refresh faster than the 30 Hz simulation. capture() is given
+# the draw items before each tick and blend() the current ones with how
+# far the clock is into the next tick (0..1). Anything that moved more
+# than `limit` pixels in one tick (a frog sent back to the start, a new
+# game) is drawn where it is.
+class Interpolator():
+
+    def __init__(self, limit=64):
+        self.limit = limit
+        self.previous = {}
+
+    def capture(self, items):
+        self.previous = {key: (position[0], position[1])
+                         for key, surface, position, area in items}
+
+    def blend(self, items, alpha):
+        previous = self.previous
+        blended = []
+        for key, surface, position, area in items:
+            old = previous.get(key)
+            if old is not None:
+                dx = position[0] - old[0]
+                dy = position[1] - old[1]
+                if abs(dx) + abs(dy) <= self.limit:
+                    position = (old[0] + dx * alpha, old[1] + dy * alpha)
+            blended.append((key, surface, position, area))
+        return blended
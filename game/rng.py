@@ -0,0 +1,112 @@
+import os
+import zlib
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MASK = (1 << 64) - 1
+GAMMA = 0x9E3779B97F4A7C15
+
+
+# splitmix64 finalizer: draw number `counter` of a stream is
+# mix(key + counter * GAMMA), so any draw can be computed on its own and
+# the scalar and numpy versions give the same bits.
+def mix(x):
+    x = (x ^ (x >> 30)) * 0xBF58476D1CE4E5B9 & MASK
+    x = (x ^ (x >> 27)) * 0x94D049BB133111EB & MASK
+    return x ^ (x >> 31)
+
+
+def mixArray(x):
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def streamKey(seed, name):
+    return mix((seed & MASK) ^ (zlib.crc32(name.encode()) * GAMMA & MASK))
+
+
+def streamKeys(seeds, name):
+    salt = np.uint64(zlib.crc32(name.encode()) * GAMMA & MASK)
+    return mixArray(np.asarray(seeds, np.uint64) ^ salt)
+
+
+def randomSeed():
+    return int.from_bytes(os.urandom(8), 'little')
+
+
+class Stream():
+    # Drop-in for the random.Random methods the game uses
+
+    def __init__(self, seed, name):
+        self.key = streamKey(seed, name)
+        self.counter = 0
+
+    def next(self):
+        value = mix((self.key + self.counter * GAMMA) & MASK)
+        self.counter += 1
+        return value
+
+    def below(self, n):
+        return self.next() % n
+
+    def randint(self, a, b):
+        return a + self.below(b - a + 1)
+
+    def choice(self, seq):
+        if not len(seq):
+            raise IndexError('Cannot choose from an empty sequence')
+        return seq[self.below(len(seq))]
+
+    def random(self):
+        return (self.next() >> 11) * (1.0 / (1 << 53))
+
+
+# Independent streams of one game: lane changes can be drawn more or less
+# often without shifting the events stream, and the other way around.
+class SessionRandom():
+
+    STREAMS = ("lanes", "events")
+
+    def __init__(self, seed=None):
+        self.seed = randomSeed() if seed is None else seed
+        for name in self.STREAMS:
+            setattr(self, name, Stream(self.seed, name))
+
+    def getstate(self):
+        return tuple(getattr(self, name).counter for name in self.STREAMS)
+
+    def setstate(self, state):
+        for name, counter in zip(self.STREAMS, state):
+            getattr(self, name).counter = counter
+
+
+# One Stream per row, stepped with numpy; row i draws exactly what
+# Stream(seeds[i], name) would.
+class StreamArray():
+
+    def __init__(self, seeds, name):
+        if np is None:
+            raise ImportError("StreamArray requires numpy")
+        self.name = name
+        self.keys = streamKeys(seeds, name)
+        self.counters = np.zeros(len(self.keys), np.uint64)
+
+    def reseed(self, rows, seeds):
+        self.keys[rows] = streamKeys(seeds, self.name)
+        self.counters[rows] = 0
+
+    def next(self, rows):
+        values = mixArray(self.keys[rows] +
+                          self.counters[rows] * np.uint64(GAMMA))
+        self.counters[rows] += np.uint64(1)
+        return values
+
+    def below(self, n, rows):
+        return (self.next(rows) % np.asarray(n, np.uint64)).astype(np.int64)
+
+    def randint(self, a, b, rows):
+        return a + self.below(b - a + 1, rows)
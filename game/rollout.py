@@ -0,0 +1,136 @@
+import argparse
+import json
+import multiprocessing
+import random as Random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from game.policies import POLICIES
+from game.sim import FroggerSim
+
+MAX_NODES = 2000
+
+
+def episodeSeeds(seed, episodes):
+    rng = Random.Random(seed)
+    return [rng.getrandbits(32) for _ in range(episodes)]
+
+
+def runEpisode(policy, seed, max_ticks):
+    sim = FroggerSim(seed)
+    policy.reset(seed)
+    done = False
+    while not done and sim.tick < max_ticks:
+        reward, done = sim.step(policy(sim))
+    session = sim.session
+    result = {
+        "seed": seed,
+        "points": session.game.points,
+        "level": session.game.level,
+        "ticks": sim.tick,
+        "deaths": dict(session.deaths),
+    }
+    if hasattr(policy, "report"):
+        result["policy"] = policy.report()
+    return result
+
+
+def makePolicy(policy_name, max_nodes=MAX_NODES):
+    # bots that plan stop on a node count instead of the clock, so the
+    # same seeds score the same on any machine, load or worker count
+    if policy_name in ("search", "table"):
+        return POLICIES[policy_name](budget=None, max_nodes=max_nodes)
+    return POLICIES[policy_name]()
+
+
+def runShard(policy_name, seeds, max_ticks, max_nodes=MAX_NODES):
+    policy = makePolicy(policy_name, max_nodes)
+    return [runEpisode(policy, seed, max_ticks) for seed in seeds]
+
+
+def shards(seeds, count):
+    size = max(1, -(-len(seeds) // count))
+    return [seeds[i:i + size] for i in range(0, len(seeds), size)]
+
+
+def summarize(results, elapsed):
+    points = [r["points"] for r in results]
+    ticks = sum(r["ticks"] for r in results)
+    levels = {}
+    deaths = {"car": 0, "water": 0, "time": 0}
+    for r in results:
+        levels[r["level"]] = levels.get(r["level"], 0) + 1
+        for cause, count in r["deaths"].items():
+            deaths[cause] += count
+    summary = {
+        "episodes": len(results),
+        "points": {
+            "mean": sum(points) / len(points) if points else 0,
+            "min": min(points, default=0),
+            "max": max(points, default=0),
+        },
+        "levels": {str(k): levels[k] for k in sorted(levels)},
+        "deaths": deaths,
+        "ticks": ticks,
+        "seconds": round(elapsed, 3),
+        "ticks_per_second": round(ticks / elapsed) if elapsed else 0,
+    }
+    reports = [r["policy"] for r in results if "policy" in r]
+    if reports:
+        # counters add up; a rate is recomputed from the summed seconds
+        totals = {}
+        for report in reports:
+            for name, value in report.items():
+                if not name.endswith("_per_second"):
+                    totals[name] = totals.get(name, 0) + value
+        seconds = totals.get("seconds", 0)
+        for name in reports[0]:
+            if name.endswith("_per_second"):
+                base = totals.get(name[:-len("_per_second")], 0)
+                totals[name] = round(base / seconds) if seconds else 0
+            elif isinstance(totals[name], float):
+                totals[name] = round(totals[name], 3)
+        summary["policy"] = totals
+    return summary
+
+
+def rollout(episodes, workers=1, policy="random", seed=0, max_ticks=18000,
+            max_nodes=MAX_NODES):
+    seeds = episodeSeeds(seed, episodes)
+    start = time.perf_counter()
+    if workers <= 1:
+        results = runShard(policy, seeds, max_ticks, max_nodes)
+    else:
+        # a few shards per worker keeps the pool busy at the tail; spawn
+        # avoids forking a process that may hold SDL threads
+        parts = shards(seeds, workers * 4)
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(workers, mp_context=context) as pool:
+            futures = [pool.submit(runShard, policy, part, max_ticks,
+                                   max_nodes)
+                       for part in parts]
+            results = [r for future in futures for r in future.result()]
+    return summarize(results, time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m game.frogger rollout')
+    parser.add_argument('--episodes', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--policy', choices=sorted(POLICIES),
+                        default='random')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-ticks', type=int, default=18000)
+    parser.add_argument('--max-nodes', type=int, default=MAX_NODES,
+                        help='nodes a search plan may expand')
+    parser.add_argument('--output')
+    args = parser.parse_args(argv)
+
+    summary = rollout(args.episodes, args.workers, args.policy, args.seed,
+                      args.max_ticks, args.max_nodes)
+    text = json.dumps(summary, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    print(text)
+    return summary
@@ -0,0 +1,70 @@
+import os
+
+os.environ.setdefault('FROGGER_HEADLESS', '1')
+
+from game import frogger  # noqa: E402
+
+
+# One game stepped with no clock cap. The per-entity objects keep it near
+# 60-110k ticks/s on one core, short of hundreds of thousands; for that,
+# run many games at once with batch.BatchFrogger (about 850k game ticks/s
+# at n=1024) or rollout's worker processes.
+class FroggerSim():
+
+    ACTIONS = (None, "up", "down", "left", "right")
+
+    def __init__(self, seed=None, session_class=frogger.Session):
+        self.session_class = session_class
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        self.session = self.session_class(seed=seed)
+        self.seed = self.session.seed
+        return self.state()
+
+    @property
+    def tick(self):
+        return self.session.tick
+
+    def step(self, action=None):
+        if isinstance(action, int):
+            action = self.ACTIONS[action]
+        session = self.session
+        points = session.game.points
+        if action is not None:
+            session.pressKey(action)
+        session.update()
+        return session.game.points - points, session.frog.lives <= 0
+
+    def advance(self, ticks):
+        # `ticks` idle ticks, jumped over when the frog is out of reach
+        self.session.advance(ticks)
+        return self.tick
+
+    def run(self, ticks, action=None):
+        for _ in range(ticks):
+            reward, done = self.step(action)
+            if done:
+                break
+        return self.tick
+
+    def state(self):
+        session = self.session
+        return {
+            "tick": session.tick,
+            "frog": tuple(session.frog.position),
+            "lives": session.frog.lives,
+            "level": session.game.level,
+            "speed": session.game.speed,
+            "points": session.game.points,
+            "time": session.game.time,
+            "arrived": len(session.chegaram),
+            "enemys": entityState(session.enemys),
+            "plataforms": entityState(session.plataforms),
+        }
+
+
+def entityState(entities):
+    if hasattr(entities, "state"):
+        return entities.state()
+    return [(e.position[0], e.position[1], e.way) for e in entities]
@@ -0,0 +1,77 @@
+import heapq
+import math
+
+from game.pool import spawn
+
+
+def laneInterval(interval, game):
+    # ticks between two spawns of a lane, shorter as the level goes up
+    return (interval * game.speed) / game.level
+
+
+# Spawns the entities of a lane table (rows of x, y, first, interval and
+# the constructor arguments after the position) from a min-heap of the
+# tick each lane is next due, so a tick without spawns costs one peek
+# whatever the number of lanes. Lanes keep the countdown semantics of
+# createEnemys: a lane spawns once its counter is <= 0 and the counter
+# then restarts from laneInterval().
+class SpawnScheduler():
+
+    def __init__(self, lanes, cls, interval=laneInterval):
+        self.lanes = lanes
+        self.cls = cls
+        self.interval = interval
+        self.setCounters([lane[2] for lane in lanes])
+
+    def setCounters(self, counters):
+        self.now = 0
+        # counters[i] is the lane's counter as checked at tick since[i]
+        self.counters = list(counters)
+        self.since = [0] * len(self.counters)
+        self.heap = [(max(math.ceil(counter), 0), i)
+                     for i, counter in enumerate(self.counters)]
+        heapq.heapify(self.heap)
+
+    def getCounters(self):
+        return [counter - (self.now - since)
+                for counter, since in zip(self.counters, self.since)]
+
+    def update(self, entities, game, pool=None):
+        heap = self.heap
+        now = self.now
+        while heap and heap[0][0] <= now:
+            i = heap[0][1]
+            x, y, first, interval, *args = self.lanes[i]
+            counter = self.interval(interval, game)
+            self.counters[i] = counter
+            self.since[i] = now + 1
+            heapq.heapreplace(heap, (now + 1 + max(math.ceil(counter), 0), i))
+            entities.append(spawn(pool, self.cls, x, y, *args))
+        self.now = now + 1
+
+    def period(self, i, game):
+        # ticks from one spawn of lane i to the next at the current level
+        return 1 + max(math.ceil(self.interval(self.lanes[i][3], game)), 0)
+
+    def skip(self, ticks, game):
+        # jumps `ticks` ticks ahead without spawning anything; returns, per
+        # lane, the (first tick, period, count) of the spawns skipped over,
+        # ticks counted from the first skipped one
+        schedule = [None] * len(self.lanes)
+        heap = []
+        for due, i in self.heap:
+            first = due - self.now
+            period = self.period(i, game)
+            count = 0
+            if first < ticks:
+                count = (ticks - 1 - first) // period + 1
+                last = self.now + first + (count - 1) * period
+                self.counters[i] = self.interval(self.lanes[i][3], game)
+                self.since[i] = last + 1
+                due = last + period
+            schedule[i] = (first, period, count)
+            heap.append((due, i))
+        heapq.heapify(heap)
+        self.heap = heap
+        self.now += ticks
+        return schedule
@@ -0,0 +1,10 @@
+import os
+
+# The windowed game is imported before any test module: game.sim and
+# game.batch would otherwise load it headless whenever a module importing
+# them is collected first, and the font, render and startup tests would
+# have no display to run on. Without a screen, run the tests with
+# SDL_VIDEODRIVER=dummy and SDL_AUDIODRIVER=dummy.
+os.environ.pop("FROGGER_HEADLESS", None)
+
+from game import frogger  # noqa: E402,F401
@@ -0,0 +1,109 @@
+import random
+import numpy as np
+import pytest
+from game import frogger
+from game.batch import HOMES, BatchFrogger
+
+
+class NoLaneChange(random.Random):
+
+    def randint(self, a, b):
+        return 1
+
+
+class FixedBatch(BatchFrogger):
+
+    def changeRoad(self):
+        pass
+
+
+ACTIONS = ("up", None, None, None, None, "up", None, "left", None, None,
+           None, None, "right", None, None, None, None, "up")
+KEYS = {None: 0, "up": 1, "down": 2, "left": 3, "right": 4}
+
+
+def test_shapes():
+    batch = BatchFrogger(n=8, seed=0)
+    obs, rewards, lives, done = batch.step(np.zeros(8, int))
+    assert obs.shape == (8, 14)
+    assert rewards.shape == lives.shape == done.shape == (8,)
+    assert not done.any()
+
+
+def run_both(session, batch, actions):
+    for action in actions:
+        if action is not None:
+            session.pressKey(action)
+        points = session.game.points
+        session.update()
+        obs, rewards, lives, done = batch.step([KEYS[action], 0])
+        if session.frog.lives <= 0:
+            assert done[0]
+            return
+        assert rewards[0] == session.game.points - points
+        assert [batch.frog_x[0], batch.frog_y[0]] == session.frog.position
+        assert lives[0] == session.frog.lives
+        assert batch.time[0] == session.game.time
+        assert batch.level[0] == session.game.level
+        assert batch.arrived[0] == len(session.chegaram)
+        taken = {arrived.position[0] for arrived in session.chegaram}
+        assert obs[0, 9:].tolist() == [slot in taken
+                                       for left, right, slot in HOMES]
+        cars = batch.car["alive"][0]
+        assert sorted(zip(batch.car["x"][0][cars].tolist(),
+                          batch.car["y"][0][cars].tolist())) == sorted(
+            tuple(e.position) for e in session.enemys)
+
+
+def teleport(session, batch, position):
+    session.frog.position = list(position)
+    batch.frog_x[0], batch.frog_y[0] = position
+
+
+@pytest.mark.parametrize("offset", [0, 3, 5, 11])
+def test_matches_session(offset):
+    session = frogger.Session(rng=NoLaneChange())
+    batch = FixedBatch(n=2, seed=0)
+    actions = [ACTIONS[(i * 7 + offset) % len(ACTIONS)] for i in range(3000)]
+    run_both(session, batch, actions)
+
+
+@pytest.mark.parametrize(["dx", "ticks"], [(10, 150), (60, 80), (-40, 30)])
+def test_log_ride_matches_session(dx, ticks):
+    session = frogger.Session(rng=NoLaneChange())
+    batch = FixedBatch(n=2, seed=0)
+    run_both(session, batch, [None] * 40)
+    log = session.plataforms[0]
+    teleport(session, batch, [log.position[0] + dx, log.position[1]])
+    run_both(session, batch, [None] * ticks)
+
+
+def test_arrivals_and_next_level_match_session():
+    session = frogger.Session(rng=NoLaneChange())
+    batch = FixedBatch(n=2, seed=0)
+    for x in (43, 125, 207, 289, 371, 60):
+        teleport(session, batch, [x, 46])
+        run_both(session, batch, ["up"] + [None] * 6)
+    assert session.game.level == 2
+    assert batch.points[0] == session.game.points > 100
+
+
+def test_auto_reset():
+    batch = BatchFrogger(n=4, seed=1)
+    done_seen = np.zeros(4, bool)
+    for i in range(4000):
+        obs, rewards, lives, done = batch.step(0)
+        done_seen |= done
+        if done.any():
+            assert (obs[done, 5] == 3).all()
+            assert (batch.tick[done] == 0).all()
+    assert done_seen.all()
+
+
+@pytest.mark.parametrize("seed", [0, 4])
+def test_lane_changes_match_seeded_session(seed):
+    batch = BatchFrogger(n=2, seed=seed)
+    session = frogger.Session(seed=int(batch.seeds[0]))
+    actions = [ACTIONS[(i * 5 + seed) % len(ACTIONS)] for i in range(3000)]
+    run_both(session, batch, actions)
+    assert session.lanes.counter > 0
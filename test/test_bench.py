@@ -0,0 +1,26 @@
+import pytest
+from game import bench
+
+NAMES = ["createEnemys", "createPlataform", "moveList", "destroyEnemys",
+         "frogOnTheStreet", "frogInTheLake", "drawList", "tick"]
+
+
+@pytest.mark.parametrize("count", [0, 10, 100])
+def test_run_times_every_hot_path(count):
+    results = bench.run([count], budget=0)
+    assert [r["name"] for r in results["results"]] == NAMES
+    for result in results["results"]:
+        assert result["count"] == count
+        assert result["repeat"] == 3
+        assert 0 <= result["min_us"] <= result["median_us"]
+
+
+@pytest.mark.parametrize("median,regression", [(100, False), (125, False),
+                                               (126, True)])
+def test_compare_flags_regressions(median, regression):
+    baseline = {"results": [{"name": "tick", "count": 10, "median_us": 100}]}
+    results = {"results": [{"name": "tick", "count": 10, "median_us": median},
+                           {"name": "tick", "count": 20, "median_us": 1}]}
+    rows = bench.compare(results, baseline)
+    assert len(rows) == 1
+    assert rows[0]["regression"] == regression
@@ -126,3 +126,22 @@ def test_car_change_road_multiple_time(car_pos_y_list, target_index,
     assert target_enemy.factor == FACTOR
     assert target_enemy.position[0] == 0
     assert target_enemy.way == WAY
+
+
+def test_car_has_no_dict():
+    enemy = frogger.Enemy([0, 280], frogger.sprite_car1, "right", 1)
+    assert not hasattr(enemy, "__dict__")
+    with pytest.raises(AttributeError):
+        enemy.speed = 3
+
+
+def test_car_rect_follows_position():
+    enemy = frogger.Enemy([0, 280], frogger.sprite_car1, "right", 2)
+    rect = enemy.rect()
+    enemy.move(3)
+    enemy.position[1] = 318
+    assert enemy.rect() is rect
+    assert rect.topleft == (6, 318)
+    assert rect.size == frogger.sprite_car1.get_size()
+    enemy.reset(506, 397, frogger.sprite_car2, "left", 2)
+    assert enemy.rect().size == frogger.sprite_car2.get_size()
@@ -0,0 +1,60 @@
+import pytest
+from pygame import Rect
+from game import frogger
+from game.entitystore import EntityStore, StoreSession
+from game.sim import FroggerSim
+
+
+def make_store(xs, way="left"):
+    store = EntityStore(capacity=2)
+    for x in xs:
+        store.append(frogger.Enemy([x, 300], frogger.sprite_car1, way, 2))
+    return store
+
+
+def test_append_grows():
+    store = make_store(range(10))
+    assert len(store) == 10
+    assert store.width[9] == frogger.sprite_car1.get_width()
+    assert store.direction[0] == -1
+
+
+def test_move():
+    store = make_store([0, 100], "right")
+    store.move(3)
+    assert store.x[:2].tolist() == [6, 106]
+
+
+@pytest.mark.parametrize(["xs", "expected"], [
+    ([-81], []),
+    ([-80], [-80]),
+    ([-1000, 0, 9999], [0]),
+    ([-81, 0, -82, 10, 517, 20], [0, 10, 20]),
+    ([], []),
+])
+def test_despawn(xs, expected):
+    store = make_store(xs)
+    store.despawn(-80, 516)
+    assert [x for x, y, way in store.state()] == expected
+
+
+@pytest.mark.parametrize(["frog_pos", "expected"], [
+    ([100, 100], []),
+    ([0, 300], [0]),
+    ([56, 300], [1]),
+    ([54, 300], [0, 1]),
+])
+def test_overlaps_matches_colliderect(frog_pos, expected):
+    store = make_store([0, 55])
+    frog_rect = Rect(frog_pos[0], frog_pos[1], 30, 30)
+    assert store.overlaps(frog_rect).tolist() == expected
+
+
+@pytest.mark.parametrize("seed", [1, 5, 9])
+def test_store_session_matches_session(seed):
+    sims = [FroggerSim(seed), FroggerSim(seed, StoreSession)]
+    for i in range(1500):
+        action = ("up", None, None, "left", None, "right")[i % 6]
+        for sim in sims:
+            sim.step(action)
+    assert sims[0].state() == sims[1].state()
@@ -1,5 +1,6 @@
 import pytest
 from game import frogger
+from unittest.mock import patch
 
 frog = frogger.Frog([0, 0], frogger.sprite_sapo)
 CAR_POS = [100, 100]
@@ -111,3 +112,25 @@ def test_all_frog_arrived(allFrogArrived, current_level, expected_level):
     platform = []
     frogger.nextLevel(allFrogArrived, enemys, platform, frog, game)
     assert game.level == expected_level
+
+
+@pytest.mark.parametrize(["key", "expected_way"], [
+    ("up", "up"),
+    ("down", "down"),
+    ("left", "left"),
+    ("right", "right"),
+    ("a", "up"),
+])
+def test_update_sprite_uses_preloaded_sheets(key, expected_way):
+    sprite_frog = frogger.Frog([0, 0], frogger.sprite_sapo)
+    with patch("pygame.image.load") as load:
+        sprite_frog.updateSprite(key)
+    load.assert_not_called()
+    assert sprite_frog.sprite is frogger.frog_sprites.sheets[expected_way]
+    assert sprite_frog.frames is frogger.frog_sprites.frames[expected_way]
+
+
+def test_frames_are_cut_once():
+    frames = frogger.frog_sprites.frames["left"]
+    assert [frame.get_size() for frame in frames] == [(30, 30)] * 3
+    assert frames[1].get_offset() == (30, 0)
@@ -0,0 +1,63 @@
+import pytest
+from pygame import Rect
+from game import frogger
+from game.hazards import CELL, COLUMNS, ROWS
+
+
+def steady_session(seed, ticks=1500):
+    # lane changes are random, so the table cannot know about them
+    session = frogger.Session(seed=seed)
+    session.changeRoad = lambda: None
+    for i in range(ticks):
+        session.update()
+    return session
+
+
+def hit(x, y, entities):
+    return any(Rect(x, y, 30, 30).colliderect(e.rect()) for e in entities)
+
+
+@pytest.mark.parametrize("seed", [0, 6])
+def test_table_matches_the_traffic(seed):
+    session = steady_session(seed)
+    table = session.hazards()
+    for i in range(150):
+        session.update()
+        tick = session.tick - 1
+        for y in ROWS[1:-1]:
+            for cell in range(0, COLUMNS - 2, 3):
+                xs = range(cell * CELL, cell * CELL + CELL)
+                safe = table.safe(cell * CELL, y, tick)
+                if y > 240:
+                    assert safe == (not any(hit(x, y, session.enemys)
+                                            for x in xs))
+                elif safe:
+                    assert all(hit(x, y, session.plataforms) for x in xs)
+
+
+def test_next_safe():
+    table = steady_session(2).hazards()
+    for y in (436, 397, 306, 161):
+        for x in (0, 130, 207, 390):
+            tick = 5000
+            found = table.nextSafe(x, y, tick)
+            assert found is not None
+            assert table.safe(x, y, found)
+            assert not any(table.safe(x, y, t) for t in range(tick, found))
+
+
+def test_start_row_is_always_safe():
+    table = frogger.Session(seed=0).hazards()
+    assert table.safe(207, 475, 12345)
+    assert table.nextSafe(207, 475, 12345) == 12345
+    assert table.danger(475) == 0.0
+    assert table.danger(397) > 0
+
+
+def test_rebuilt_when_the_level_changes():
+    session = steady_session(1, 100)
+    table = session.hazards()
+    assert session.hazards() is table
+    session.game.incLevel()
+    session.game.incSpeed()
+    assert session.hazards() is not table
@@ -0,0 +1,35 @@
+import random
+import pytest
+from game import frogger
+
+TEMPLATE = 'Time: {0}           Lifes: {1}'
+
+
+def test_line_is_cached_until_values_change():
+    hud = frogger.Hud(frogger.info_font)
+    first = hud.line(TEMPLATE, (30, 3))
+    assert hud.line(TEMPLATE, (30, 3)) is first
+    assert hud.line(TEMPLATE, (29, 3)) is not first
+
+
+@pytest.mark.parametrize("values", [(0, 3), (1234567890, 2), (-5, 0)])
+def test_numbers_use_glyph_atlas(values):
+    hud = frogger.Hud(frogger.info_font)
+    hud.line(TEMPLATE, (30, 3))
+    renders = hud.renders
+    surface = hud.line(TEMPLATE, values)
+    assert hud.renders == renders
+    labels = hud.label('Time: ').get_width() + hud.label(
+        '           Lifes: ').get_width()
+    digits = sum(hud.glyphs[c].get_width() for v in values for c in str(v))
+    assert surface.get_width() == labels + digits
+
+
+def test_no_font_rendering_in_steady_state():
+    session = frogger.Session(rng=random.Random(0))
+    session.drawItems()
+    renders = frogger.hud.renders
+    for i in range(29):
+        session.update()
+        session.drawItems()
+    assert frogger.hud.renders == renders
@@ -0,0 +1,64 @@
+import pytest
+from game import frogger
+from game.kinematics import lifetime
+from game.sim import FroggerSim
+
+
+def full_state(sim):
+    session = sim.session
+    return (sim.state(), session.ticks_time, session.ticks_enemys,
+            session.ticks_plataforms, dict(session.deaths),
+            session.rng.getstate())
+
+
+def jump_and_step(seed, warmup, ticks, level=None):
+    sims = [FroggerSim(seed), FroggerSim(seed)]
+    for sim in sims:
+        if level:
+            sim.session.game.speed, sim.session.game.level = level
+        for i in range(warmup):
+            sim.step(sim.ACTIONS[i % 9 % 5])
+    jumped, stepped = sims
+    jumped.advance(ticks)
+    for i in range(ticks):
+        stepped.session.update()
+    return jumped, stepped
+
+
+@pytest.mark.parametrize("seed", [0, 3])
+@pytest.mark.parametrize(["ticks", "level"], [
+    (1, None), (7, None), (400, None), (5000, None), (40000, None),
+    (3000, (5, 3)), (3000, (12, 10)),
+])
+def test_jump_matches_stepping(seed, ticks, level):
+    jumped, stepped = jump_and_step(seed, 0, ticks, level)
+    assert full_state(jumped) == full_state(stepped)
+
+
+@pytest.mark.parametrize("warmup", [1, 30, 95])
+def test_jump_after_moves_matches_stepping(warmup):
+    # the frog may still be moving or away from the start: those ticks are
+    # stepped until a jump is safe
+    jumped, stepped = jump_and_step(5, warmup, 2000)
+    assert full_state(jumped) == full_state(stepped)
+
+
+def test_long_jump_counts_timeouts():
+    jumped, stepped = jump_and_step(1, 0, 31 * 30 * 3 + 40)
+    assert jumped.session.deaths["time"] == 3
+    assert full_state(jumped) == full_state(stepped)
+
+
+def test_jump_reuses_pooled_entities():
+    sim = FroggerSim(2)
+    sim.advance(600)
+    cars = sim.session.pools()["cars"]
+    sim.advance(20000)
+    assert sim.session.pools()["cars"]["misses"] - cars["misses"] <= 5
+
+
+@pytest.mark.parametrize(["x", "v", "expected"], [
+    (-55, 3, 190), (506, -6, 97), (516, -3, 198), (0, 0, None), (516, 3, 0),
+])
+def test_lifetime(x, v, expected):
+    assert lifetime(x, v, *frogger.CAR_BOUNDS) == expected
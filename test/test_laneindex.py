@@ -0,0 +1,53 @@
+import pytest
+from pygame import Rect
+from game import frogger
+from game.laneindex import LaneIndex
+
+
+def make_index(cars):
+    index = LaneIndex()
+    enemys = []
+    for x, y, way in cars:
+        enemy = frogger.Enemy([x, y], frogger.sprite_car1, way, 1)
+        index.add(enemy)
+        enemys.append(enemy)
+    return index, enemys
+
+
+@pytest.mark.parametrize(["frog_pos", "expected"], [
+    ([100, 100], []),
+    ([0, 280], [0]),
+    ([60, 280], [1]),
+    ([40, 300], [0, 2]),
+    ([54, 270], [0, 1]),
+    ([40, 318], [2]),
+    ([300, 318], []),
+])
+def test_query(frog_pos, expected):
+    index, enemys = make_index([(0, 280, "right"), (80, 280, "right"),
+                                (50, 318, "left")])
+    found = index.query(Rect(frog_pos[0], frog_pos[1], 30, 30))
+    assert found == [enemys[i] for i in expected]
+
+
+def test_query_keeps_spawn_order():
+    index, enemys = make_index([(40, 280, "left"), (0, 280, "right")])
+    assert index.query(Rect(30, 280, 30, 30)) == enemys
+
+
+def test_update_after_change_road():
+    index, enemys = make_index([(0, 280, "right")])
+    enemys[0].position[1] = 319
+    index.update(enemys[0])
+    assert index.query(Rect(0, 280, 30, 20)) == []
+    assert index.query(Rect(0, 330, 30, 30)) == enemys
+    assert len(index.lanes) == 1
+
+
+def test_prune():
+    index, enemys = make_index([(-90, 280, "left"), (0, 280, "left"),
+                                (600, 280, "left")])
+    index.prune(enemys[1:2], -80, 516)
+    assert len(index) == 1
+    assert index.query(Rect(0, 280, 30, 30)) == enemys[1:2]
+
@@ -0,0 +1,56 @@
+import pytest
+from game import frogger
+from game.lanering import LaneRings, Ring, RingSession
+from game.sim import FroggerSim
+
+
+def test_ring_wraps_and_grows():
+    ring = Ring(capacity=2)
+    ring.push("a")
+    ring.push("b")
+    assert ring.pop() == "a"
+    ring.push("c")
+    ring.push("d")
+    assert len(ring.items) == 4
+    assert list(ring) == ["b", "c", "d"]
+
+
+def make_rings(cars):
+    rings = LaneRings(-80, 516)
+    for x, y, way in cars:
+        rings.append(frogger.Enemy([x, y], frogger.sprite_car1, way, 1))
+    return rings
+
+
+def test_iteration_follows_spawn_order():
+    rings = make_rings([(0, 280, "right"), (500, 318, "left"),
+                        (10, 280, "right")])
+    assert [e.position[0] for e in rings] == [0, 500, 10]
+    assert rings[1].position[0] == 500
+    assert rings[-1].position[0] == 10
+    with pytest.raises(IndexError):
+        rings[3]
+
+
+@pytest.mark.parametrize(["cars", "expected"], [
+    ([(517, 280, "right"), (0, 280, "right")], [0]),
+    ([(-81, 318, "left"), (-82, 318, "left"), (5, 318, "left")], [5]),
+    ([(100, 280, "right"), (-81, 318, "left")], [100]),
+    ([], []),
+])
+def test_despawn(cars, expected):
+    rings = make_rings(cars)
+    removed = rings.despawn()
+    assert [e.position[0] for e in rings] == expected
+    assert sum(len(ring) for ring in rings.rings.values()) == len(expected)
+    assert len(removed) == len(cars) - len(expected)
+
+
+@pytest.mark.parametrize("seed", [1, 5, 9, 13])
+def test_ring_session_matches_session(seed):
+    sims = [FroggerSim(seed), FroggerSim(seed, RingSession)]
+    for i in range(3000):
+        action = ("up", None, None, "left", None, "right", None)[i % 7]
+        for sim in sims:
+            sim.step(action)
+        assert sims[0].state() == sims[1].state()
@@ -0,0 +1,145 @@
+import os
+import subprocess
+import sys
+import pytest
+from game.loop import FixedStep, FrameSkipper
+
+
+class FakeClock():
+
+    def __init__(self):
+        self.now = 100.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def stepper(max_steps=5):
+    clock = FakeClock()
+    return FixedStep(30, max_steps, clock, clock.sleep), clock
+
+
+@pytest.mark.parametrize("frame", [1 / 30, 0.07, 0.1, 0.01])
+def test_ticks_follow_wall_clock(frame):
+    loop, clock = stepper()
+    total = 0
+    for i in range(round(2 / frame)):
+        clock.now += frame
+        total += loop.advance()
+    assert total == int((clock.now - 100) * 30 + 1e-6)
+    assert loop.dropped == 0
+
+
+def test_catch_up_is_capped():
+    loop, clock = stepper(max_steps=3)
+    clock.now += 1.0
+    assert loop.advance() == 3
+    assert loop.dropped == 27
+    assert loop.alpha() == 0
+    clock.now += 1 / 30
+    assert loop.advance() == 1
+
+
+def test_wait_sleeps_until_next_tick():
+    loop, clock = stepper()
+    clock.now += 0.05
+    assert loop.advance() == 1
+    assert loop.alpha() == pytest.approx(0.5)
+    clock.now += 0.004
+    loop.wait()
+    assert clock.now == pytest.approx(100 + 2 / 30)
+    assert loop.advance() == 1
+    assert loop.report() == {"ticks": 2, "dropped_ticks": 0}
+
+
+def run_with_skipper(draw_cost, max_skip, seconds=3):
+    loop, clock = stepper()
+    skipper = FrameSkipper(max_skip)
+    undrawn = []
+    while clock.now < 100 + seconds:
+        loop.max_steps = skipper.allowed()
+        skipper.ticked(loop.advance())
+        if skipper.shouldDraw(loop.remaining()):
+            undrawn.append(skipper.pending - 1)
+            clock.now += draw_cost
+            skipper.drew(draw_cost)
+        loop.wait()
+    return loop, skipper, undrawn
+
+
+@pytest.mark.parametrize(["draw_cost", "max_skip"], [(0.01, 4), (0.07, 4),
+                                                     (0.2, 9)])
+def test_frame_skip_keeps_ticks_on_schedule(draw_cost, max_skip):
+    loop, skipper, undrawn = run_with_skipper(draw_cost, max_skip)
+    assert loop.ticks == pytest.approx(90, abs=max_skip + 1)
+    assert loop.dropped == 0
+    assert max(undrawn) <= max_skip
+    assert skipper.skipped == sum(undrawn)
+    assert skipper.report()["draw_ms"] == pytest.approx(draw_cost * 1000,
+                                                        rel=0.01)
+
+
+def test_frame_skip_limit_slows_the_game_instead():
+    loop, skipper, undrawn = run_with_skipper(0.3, 2)
+    assert max(undrawn) == 2
+    assert loop.ticks < 45
+    assert loop.dropped > 0
+
+
+def test_nothing_to_draw_without_a_new_tick():
+    skipper = FrameSkipper(4)
+    assert not skipper.shouldDraw(1.0)
+    skipper.ticked(1)
+    assert skipper.shouldDraw(0.01)
+    assert not skipper.shouldDraw(-0.01)
+    skipper.ticked(4)
+    assert skipper.shouldDraw(-0.01)
+
+
+# frogger run as a script with both pacing options; the stepper writes down
+# the catch-up limit of every tick
+MAIN = """
+import runpy, sys, pygame
+from game import loop
+
+limits = open(sys.argv[1], "w")
+
+class Fast(loop.FixedStep):
+    def advance(self):
+        limits.write("%d\\n" % self.max_steps)
+        self.ticks += self.max_steps
+        return self.max_steps
+
+    def wait(self):
+        pass
+
+loop.FixedStep = Fast
+frames = iter([[pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE)]] +
+              [[] for i in range(60)])
+pygame.event.get = lambda *args, **kwargs: next(
+    frames, [pygame.event.Event(pygame.QUIT)])
+sys.argv = ["frogger", "--seed", "1", "--frame-skip", "4",
+            "--max-catch-up", "2"]
+try:
+    runpy.run_module("game.frogger", run_name="__main__", alter_sys=True)
+finally:
+    limits.close()
+"""
+
+
+def test_frame_skip_keeps_the_catch_up_limit(tmp_path):
+    path = str(tmp_path / "limits.txt")
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+    env.pop("FROGGER_HEADLESS", None)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", MAIN, path], cwd=root, env=env,
+                   check=True, timeout=120)
+    with open(path) as limits:
+        found = [int(line) for line in limits]
+    # FrameSkipper alone would allow 5 ticks after a drawn frame
+    assert found and max(found) == 2
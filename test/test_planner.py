@@ -0,0 +1,120 @@
+import pytest
+from game import frogger, rollout
+from game.planner import Forecast, Planner, step
+from game.policies import POLICIES, SearchPolicy
+from game.sim import FroggerSim
+
+
+def planner(**kwargs):
+    kwargs.setdefault("budget", None)
+    kwargs.setdefault("max_nodes", 20000)
+    return Planner(frogger.CAR_BOUNDS, frogger.LOG_BOUNDS, **kwargs)
+
+
+@pytest.mark.parametrize(["x", "y", "key", "expected"], [
+    (207, 475, "up", (207, 462)), (207, 33, "up", (207, 33)),
+    (207, 475, "down", (207, 475)), (2, 300, "left", (2, 300)),
+    (401, 300, "right", (401, 300)), (207, 300, "right", (221, 300)),
+])
+def test_step_keeps_the_bounds(x, y, key, expected):
+    assert step(x, y, key, 14) == expected
+
+
+@pytest.mark.parametrize("seed", [0, 4])
+def test_forecast_matches_the_traffic(seed):
+    # lane changes included: they come from copies of the same streams
+    sim = FroggerSim(seed)
+    sim.run(300)
+    session = sim.session
+    forecast = Forecast(session, 400, frogger.CAR_BOUNDS,
+                        frogger.LOG_BOUNDS)
+    for j in range(400):
+        session.spawn()
+        session.move()
+        for entities, movers in ((session.enemys, forecast.cars),
+                                 (session.plataforms, forecast.logs)):
+            actual = sorted((e.position[1], e.position[0])
+                            for e in entities)
+            expected = sorted((top, base + v * j)
+                              for top, bottom, width, base, v, first, last,
+                              order in movers if first <= j <= last)
+            assert actual == expected
+        session.changeRoad()
+        session.cleanup()
+
+
+@pytest.mark.parametrize("seed", [0, 4])
+def test_forecast_rows_keep_what_reaches_them(seed):
+    # on ticks with a lane change due, every mover is kept
+    sim = FroggerSim(seed)
+    dropped = 0
+    for _ in range(300):
+        sim.step()
+        session = sim.session
+        full = Forecast(session, 4, frogger.CAR_BOUNDS, frogger.LOG_BOUNDS)
+        part = Forecast(session, 4, frogger.CAR_BOUNDS, frogger.LOG_BOUNDS,
+                        rows=(319 - 39, 319 + 30))
+        dropped += len(part.cars) < len(full.cars)
+        for j in range(4):
+            for y in (280, 306, 319):
+                for x in range(-20, 420, 3):
+                    assert part.update(x, y, j) == full.update(x, y, j)
+    assert dropped
+
+
+def test_plan_reaches_a_home():
+    sim = FroggerSim(3)
+    sim.run(200)
+    steps, found = planner().plan(sim.session)
+    assert found
+    for key, expected in steps:
+        sim.step(key)
+        if key is not None:
+            sim.run(3)
+        if expected is not None:
+            assert sim.session.frog.position == [expected[0], expected[1]]
+    assert len(sim.session.chegaram) == 1
+    assert sim.session.deaths == {"car": 0, "water": 0, "time": 0}
+
+
+def test_plan_skips_taken_homes():
+    sim = FroggerSim(1)
+    for slot in (43, 125, 207, 289):
+        sim.session.chegaram.append(
+            frogger.Object([slot, 7], frogger.sprite_arrived))
+    sim.run(100)
+    steps, found = planner().plan(sim.session)
+    assert found
+    for key, expected in steps:
+        sim.step(key)
+        if key is not None and expected is not None:
+            sim.run(3)
+    assert sim.session.game.level == 2
+
+
+def test_partial_plan_when_out_of_nodes():
+    sim = FroggerSim(0)
+    sim.run(50)
+    steps, found = planner(max_nodes=10).plan(sim.session)
+    assert not found
+    assert steps
+
+
+def test_search_policy_plays():
+    sim = FroggerSim(2)
+    policy = SearchPolicy(max_nodes=5000, budget=None)
+    while sim.tick < 1500:
+        sim.step(policy(sim))
+    assert sim.session.game.level >= 3
+    assert sim.session.frog.lives == 3
+    report = policy.report()
+    assert report["plans"] > 0 and report["nodes"] > 0
+    assert report["nodes_per_second"] > 0
+
+
+def test_search_policy_in_rollouts():
+    assert POLICIES["search"] is SearchPolicy
+    summary = rollout.rollout(1, policy="search", max_ticks=300)
+    assert summary["policy"]["nodes"] > 0
+    assert summary["policy"]["nodes_per_second"] > 0
+    assert summary["points"]["max"] > 0
@@ -0,0 +1,167 @@
+import numpy as np
+import pytest
+from game import frogger, policytable, rollout
+from game.policies import POLICIES, TablePolicy
+from game.sim import FroggerSim
+
+# a fast level: short lane periods keep the solve to a few seconds
+SPEED = 16
+LEVEL = 14
+# the search bot takes over on a node count, so the games come out the same
+# on any machine
+MAX_NODES = 5000
+
+
+def fastSim(seed):
+    sim = FroggerSim(seed)
+    sim.session.game.speed = SPEED
+    sim.session.game.level = LEVEL
+    return sim
+
+
+def layout(seed=0):
+    return policytable.sessionLayout(fastSim(seed).session,
+                                     frogger.CAR_BOUNDS, frogger.LOG_BOUNDS)
+
+
+@pytest.fixture(scope="module")
+def cache(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("policy")
+    policytable.save(layout(), str(directory))
+    return str(directory)
+
+
+def test_layout_is_keyed_by_the_level():
+    # new games share their schedule, whatever the seed
+    assert layout(0).key == layout(5).key
+    session = FroggerSim(0).session
+    other = policytable.sessionLayout(session, frogger.CAR_BOUNDS,
+                                      frogger.LOG_BOUNDS)
+    assert other.key != layout().key
+
+
+def reachedSim(seed, ticks=50):
+    # a game that came to LEVEL from the level before: other residues
+    sim = FroggerSim(seed)
+    sim.session.game.speed = SPEED - 1
+    sim.session.game.level = LEVEL - 1
+    sim.run(ticks)
+    sim.session.game.speed = SPEED
+    sim.session.game.level = LEVEL
+    return sim
+
+
+def test_key_leaves_the_residues_out():
+    reached = policytable.sessionSpecs(reachedSim(0).session,
+                                       frogger.CAR_BOUNDS, frogger.LOG_BOUNDS)
+    fresh = policytable.sessionSpecs(fastSim(0).session, frogger.CAR_BOUNDS,
+                                     frogger.LOG_BOUNDS)
+    assert [spec.residue for spec in reached[0] + reached[1]] != \
+        [spec.residue for spec in fresh[0] + fresh[1]]
+    assert policytable.Layout(*reached).key == layout().key
+
+
+def test_layout_rows():
+    found = layout()
+    assert len(found.rows) == len(policytable.DECISION_ROWS)
+    size = 0
+    for y, band, periods, xs, offset, order in found.rows:
+        assert offset == size
+        assert periods == tuple(1 if lane is None else lane.period
+                                for lane in band)
+        # every pair of phases has its own state
+        assert sorted(order.ravel()) == list(range(order.size))
+        size += order.size * len(xs)
+    assert found.size == size
+
+
+def test_table_is_saved_and_reused(cache, tmp_path, monkeypatch):
+    assert policytable.load(layout(), str(tmp_path)) is None
+
+    def solve(layout):
+        raise AssertionError("solved again")
+    monkeypatch.setattr(policytable, "solve", solve)
+    table = policytable.load(layout(3), cache)
+    assert table.path == policytable.tablePath(layout(), cache)
+    assert table.values is None
+    table.value(0, (0, 0), 207)
+    assert isinstance(table.values, np.memmap)
+    assert table.values.dtype == np.float16
+    assert len(table.values) == table.layout.size
+
+
+def test_off_the_table_is_a_death(cache):
+    table = policytable.load(layout(), cache)
+    assert table.value(0, (0, 0), 208) == policytable.DEATH
+    assert table.value(0, (0, 0), 207) < policytable.DEATH
+
+
+def tablePolicy(cache):
+    return TablePolicy(cache_dir=cache, budget=None, max_nodes=MAX_NODES)
+
+
+def test_table_policy_plays(cache):
+    sim = fastSim(1)
+    policy = tablePolicy(cache)
+    while sim.session.game.level == LEVEL and sim.tick < 1000:
+        sim.step(policy(sim))
+    assert sim.session.game.level == LEVEL + 1
+    assert sim.session.frog.lives >= 2
+    report = policy.report()
+    assert report["lookups"] > 0
+    assert report["lookups_per_second"] > 0
+    # the next level has no table: the search bot plays it
+    searches = report["searches"]
+    for _ in range(20):
+        sim.step(policy(sim))
+    assert policy.report()["searches"] > searches
+    assert policy.report()["lookups"] == report["lookups"]
+
+
+def test_table_serves_a_level_reached_in_play(cache):
+    sim = reachedSim(4)
+    policy = tablePolicy(cache)
+    while sim.session.game.level == LEVEL and sim.tick < 1000:
+        sim.step(policy(sim))
+    assert sim.session.game.level == LEVEL + 1
+    assert sim.session.frog.lives >= 2
+    assert policy.report()["lookups"] > 0
+
+
+def test_missing_table_is_not_solved(tmp_path, monkeypatch):
+    def solve(layout):
+        raise AssertionError("solved while playing")
+    monkeypatch.setattr(policytable, "solve", solve)
+    sim = FroggerSim(0)
+    policy = TablePolicy(cache_dir=str(tmp_path), budget=None,
+                         max_nodes=MAX_NODES)
+    while sim.tick < 300:
+        sim.step(policy(sim))
+    report = policy.report()
+    assert report["lookups"] == 0 and report["searches"] > 0
+    assert sim.session.game.points > 0
+    assert not list(tmp_path.iterdir())
+
+
+def test_reset_forgets_the_tables(cache):
+    sim = fastSim(2)
+    policy = tablePolicy(cache)
+    policy(sim)
+    assert len(policy.tables) == 1
+    policy.reset()
+    assert policy.tables == {}
+
+
+def test_table_policy_is_registered():
+    assert POLICIES["table"] is TablePolicy
+
+
+def test_summary_adds_up_policy_reports():
+    results = [{"points": 10, "level": 1, "ticks": 100,
+                "deaths": {"car": 1, "water": 0, "time": 0},
+                "policy": {"lookups": lookups, "seconds": seconds,
+                           "lookups_per_second": 0}}
+               for lookups, seconds in ((30, 0.5), (10, 1.5))]
+    summary = rollout.summarize(results, 1.0)
+    assert summary["policy"] == {"lookups": 40, "seconds": 2.0,
+                                 "lookups_per_second": 20}
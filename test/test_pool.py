@@ -0,0 +1,72 @@
+import pytest
+from game import frogger
+from game.entitystore import StoreSession
+from game.lanering import RingSession
+from game.pool import Pool
+from game.sim import FroggerSim
+
+
+def test_acquire_resets_a_released_entity():
+    pool = Pool(frogger.Enemy)
+    car = pool.acquire(-55, 436, frogger.sprite_car1, "right", 1)
+    position = car.position
+    car.position[0] = 600
+    pool.release(car)
+    again = pool.acquire(506, 397, frogger.sprite_car2, "left", 2)
+    assert again is car
+    assert again.position is position
+    assert again.position == [506, 397]
+    assert (again.sprite, again.way, again.factor) == \
+        (frogger.sprite_car2, "left", 2)
+    assert pool.report() == {"hits": 1, "misses": 1, "free": 0}
+
+
+def test_destroy_releases_into_the_pool():
+    pool = Pool(frogger.Plataform)
+    plataforms = [frogger.Plataform([x, 200], frogger.sprite_plataform,
+                                    "right") for x in (-101, 0, 449, 10)]
+    gone = [plataforms[0], plataforms[2]]
+    same = plataforms
+    frogger.destroyPlataforms(plataforms, pool)
+    assert plataforms is same
+    assert [p.position[0] for p in plataforms] == [0, 10]
+    assert pool.free == gone
+
+
+def test_next_level_releases_arrived_frogs():
+    pool = Pool(frogger.Object)
+    game = frogger.Game(3, 1)
+    frog = frogger.Frog([207, 7], frogger.sprite_sapo)
+    chegaram = [pool.acquire(x, 7, frogger.sprite_arrived)
+                for x in (43, 125, 207, 289, 371)]
+    frogger.nextLevel(chegaram, [], [], frog, game, pool)
+    assert chegaram == []
+    assert len(pool) == 5
+    assert game.level == 2
+
+
+@pytest.mark.parametrize("session_class", [
+    frogger.Session, RingSession, StoreSession,
+])
+def test_steady_state_allocates_no_entities(session_class):
+    session = session_class(seed=3)
+    for i in range(600):
+        session.update()
+    pools = session.pools()
+    for i in range(3000):
+        session.update()
+    after = session.pools()
+    for name in ("cars", "logs"):
+        assert after[name]["misses"] == pools[name]["misses"]
+        assert after[name]["hits"] > pools[name]["hits"]
+
+
+def test_pooling_does_not_change_the_game():
+    pooled = FroggerSim(seed=11)
+    plain = FroggerSim(seed=11)
+    session = plain.session
+    session.car_pool = session.log_pool = session.arrived_pool = None
+    for i in range(2000):
+        action = FroggerSim.ACTIONS[i % 7 % 5]
+        assert pooled.step(action) == plain.step(action)
+        assert pooled.state() == plain.state()
@@ -0,0 +1,74 @@
+import csv
+import json
+import random
+import pytest
+from game import frogger
+from game.profiler import FrameProfiler, PHASES
+
+
+class FakeClock():
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ring_buffer_keeps_last_frames():
+    clock = FakeClock()
+    profiler = FrameProfiler(size=4, clock=clock)
+    for frame in range(10):
+        clock.now += 0.001 * (frame + 1)
+        profiler.lap("draw")
+        profiler.endFrame()
+    assert len(profiler) == 4
+    draws = [frame[PHASES.index("draw")] for frame in profiler.history()]
+    assert draws == pytest.approx([0.007, 0.008, 0.009, 0.010])
+
+
+def test_nested_phases_are_not_counted_twice():
+    clock = FakeClock()
+    profiler = FrameProfiler(clock=clock)
+    session = frogger.Session(rng=random.Random(0))
+
+    def slowSpawn():
+        clock.now += 0.002
+
+    session.spawn = slowSpawn
+    profiler.attach(session)
+    session.update()
+    clock.now += 0.001
+    profiler.lap("other")
+    profiler.endFrame()
+    frame = dict(zip(PHASES, profiler.history()[0]))
+    assert frame["spawn"] == pytest.approx(0.002)
+    assert frame["other"] == pytest.approx(0.001)
+
+
+@pytest.mark.parametrize("extension", ["csv", "json"])
+def test_export(tmp_path, extension):
+    clock = FakeClock()
+    profiler = FrameProfiler(size=2, clock=clock)
+    for frame in range(3):
+        clock.now += 0.005
+        profiler.lap("wait")
+        profiler.endFrame()
+    path = profiler.export(str(tmp_path / ("profile." + extension)))
+    with open(path) as exported:
+        if extension == "json":
+            rows = json.load(exported)
+        else:
+            rows = list(csv.DictReader(exported))
+    assert [int(row["frame"]) for row in rows] == [1, 2]
+    assert [float(row["wait"]) for row in rows] == [5.0, 5.0]
+
+
+@pytest.mark.skipif(frogger.HEADLESS, reason="needs fonts (not headless)")
+def test_overlay_renders():
+    profiler = FrameProfiler()
+    profiler.lap("draw")
+    profiler.endFrame()
+    key, surface, position, area = profiler.drawItem()
+    assert key == "profiler"
+    assert surface.get_width() > 160
@@ -0,0 +1,110 @@
+import os
+import random
+import subprocess
+import sys
+import pytest
+from game import frogger
+from game.recording import MOVE, Recorder, Replay
+from game.sim import entityState
+
+
+def state(session):
+    return (session.tick, tuple(session.frog.position), session.frog.lives,
+            session.frog.animation_counter, session.frog.can_move,
+            session.game.points, session.game.level, session.game.time,
+            len(session.chegaram), entityState(session.enemys),
+            entityState(session.plataforms))
+
+
+def record(path, seed, ticks=1500, interval=100):
+    session = frogger.Session(seed=seed)
+    recorder = Recorder(path, session.seed, interval)
+    recorder.attach(session)
+    keys = random.Random(seed)
+    states = {}
+    for _ in range(ticks):
+        states[session.tick] = state(session)
+        key = keys.choice([None, None, "up", "up", "left", "right", "down",
+                           "space"])
+        if key:
+            session.pressKey(key)
+        session.update()
+        if session.frog.lives <= 0:
+            session.newFrog()
+            recorder.attach(session)
+    states[session.tick] = state(session)
+    recorder.close()
+    return states
+
+
+@pytest.mark.parametrize("seed", [0, 8])
+def test_seek_matches_recorded_session(tmp_path, seed):
+    path = str(tmp_path / "game.frgr")
+    states = record(path, seed)
+    replay = Replay(path)
+    assert replay.seed == seed
+    assert len(replay) == 1500
+    for tick in (0, 1, 99, 100, 101, 777, 1499, 1500):
+        assert state(replay.seek(tick)) == states[tick]
+    assert state(replay.run()) == states[1500]
+
+
+def test_moves_are_compact(tmp_path):
+    path = str(tmp_path / "game.frgr")
+    record(path, 3, ticks=300, interval=10 ** 6)
+    replay = Replay(path)
+    moves = replay.moves()
+    assert moves and moves == sorted(moves, key=lambda move: move[0])
+    other = sum(1 for tick, key in moves if key == "space")
+    keyframes = sum(len(value) for tick, kind, value in replay.events
+                    if kind != "move")
+    assert (tmp_path / "game.frgr").stat().st_size < \
+        keyframes + len(moves) * MOVE.size + other * 6 + 100
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.frgr"
+    path.write_bytes(b"not a recording at all")
+    with pytest.raises(ValueError):
+        Replay(str(path))
+
+
+# frogger run as a script, with scripted keys and no waiting between ticks
+MAIN = """
+import runpy, sys, pygame
+from game import loop
+
+class Fast(loop.FixedStep):
+    def advance(self):
+        self.ticks += self.max_steps
+        return self.max_steps
+
+    def wait(self):
+        pass
+
+def key(name):
+    return [pygame.event.Event(pygame.KEYDOWN, key=name)]
+
+loop.FixedStep = Fast
+frames = iter([key(pygame.K_SPACE)] +
+              [key(pygame.K_UP) if i % 40 == 0 else [] for i in range(150)])
+pygame.event.get = lambda *args, **kwargs: next(
+    frames, [pygame.event.Event(pygame.QUIT)])
+sys.argv = ["frogger", "--seed", "3", "--record", sys.argv[1]]
+runpy.run_module("game.frogger", run_name="__main__", alter_sys=True)
+"""
+
+
+def test_records_from_the_game_loop(tmp_path):
+    path = str(tmp_path / "game.frgr")
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+    env.pop("FROGGER_HEADLESS", None)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", MAIN, path], cwd=root, env=env,
+                   check=True, timeout=120)
+    replay = Replay(path)
+    assert replay.seed == 3
+    assert len(replay) >= 600
+    assert [tick for tick, index in replay.keyframes][:3] == [0, 300, 600]
+    assert replay.moves()
+    assert state(replay.seek(len(replay))) == state(replay.run())
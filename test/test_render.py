@@ -0,0 +1,82 @@
+import random
+import pygame
+import pytest
+from game import frogger
+from game.render import DirtyRenderer, Interpolator, mergeRects
+
+
+def full_frame(items):
+    surface = pygame.Surface((448, 546))
+    surface.blit(frogger.background, (0, 0))
+    for key, sprite, position, area in items:
+        surface.blit(sprite, position, area)
+    return pygame.image.tobytes(surface, "RGB")
+
+
+@pytest.mark.parametrize(["rects", "expected"], [
+    ([(0, 0, 10, 10), (5, 5, 10, 10)], [(0, 0, 15, 15)]),
+    ([(0, 0, 10, 10), (20, 0, 10, 10)], [(0, 0, 10, 10), (20, 0, 10, 10)]),
+    ([(0, 0, 10, 10), (20, 0, 10, 10), (8, 0, 14, 5)], [(0, 0, 30, 10)]),
+    ([], []),
+])
+def test_merge_rects(rects, expected):
+    assert [tuple(rect) for rect in mergeRects(rects)] == expected
+
+
+@pytest.mark.parametrize("seed", [0, 3])
+def test_dirty_frames_match_full_redraw(seed):
+    session = frogger.Session(rng=random.Random(seed))
+    screen = pygame.Surface((448, 546))
+    renderer = DirtyRenderer(screen, frogger.background)
+    for i in range(200):
+        if i % 9 == 0:
+            session.pressKey(("up", "left", "right")[i % 3])
+        session.update()
+        items = session.drawItems()
+        renderer.draw(items)
+        assert pygame.image.tobytes(screen, "RGB") == full_frame(items)
+    report = renderer.report()
+    assert report["frames"] == 200
+    assert report["ratio"] < 0.5
+
+
+@pytest.mark.parametrize(["alpha", "car", "frog"], [
+    (0, (100, 200), (207, 475)),
+    (0.5, (103, 200), (207, 468.5)),
+    (1, (106, 200), (207, 462)),
+])
+def test_interpolator_blends_last_two_ticks(alpha, car, frog):
+    sprite = frogger.sprite_car1
+    interpolator = Interpolator()
+    interpolator.capture([("car", sprite, [100, 200], None),
+                          ("frog", sprite, [207, 475], None),
+                          ("gone", sprite, [0, 0], None)])
+    items = interpolator.blend([("car", sprite, [106, 200], None),
+                                ("frog", sprite, [207, 462], None),
+                                ("new", sprite, [5, 5], None)], alpha)
+    positions = {key: tuple(position) for key, s, position, area in items}
+    assert positions == {"car": car, "frog": frog, "new": (5, 5)}
+
+
+def test_interpolator_does_not_blend_jumps():
+    sprite = frogger.sprite_car1
+    interpolator = Interpolator()
+    interpolator.capture([("frog", sprite, [207, 46], None)])
+    items = interpolator.blend([("frog", sprite, [207, 475], None)], 0.5)
+    assert tuple(items[0][2]) == (207, 475)
+
+
+def test_interpolated_session_frames():
+    session = frogger.Session(rng=random.Random(1))
+    interpolator = Interpolator()
+    for i in range(40):
+        interpolator.capture(session.drawItems())
+        session.update()
+    before = dict(interpolator.previous)
+    items = {key: position for key, surface, position, area
+             in interpolator.blend(session.drawItems(), 0.5)}
+    moved = [enemy for enemy in session.enemys if id(enemy) in before]
+    assert moved
+    for enemy in moved:
+        old = before[id(enemy)]
+        assert items[id(enemy)][0] == (old[0] + enemy.position[0]) / 2
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from game import rng
+from game.rng import SessionRandom, Stream, StreamArray
+
+
+def test_mix_is_splitmix64():
+    # first output of the reference splitmix64 generator seeded with 0
+    assert rng.mix(rng.GAMMA) == 0xE220A8397B1DCDAF
+    assert rng.mixArray(np.array([rng.GAMMA], np.uint64))[0] == \
+        0xE220A8397B1DCDAF
+
+
+@pytest.mark.parametrize("seeds", [[0, 1, 2], [2 ** 64 - 1, 12345],
+                                   [7, 7, 7, 7]])
+def test_stream_array_matches_streams(seeds):
+    streams = [Stream(seed, "lanes") for seed in seeds]
+    array = StreamArray(seeds, "lanes")
+    rows = np.arange(len(seeds))
+    for n in (1, 2, 5, 101):
+        assert array.below(n, rows).tolist() == [s.below(n) for s in streams]
+    # only the rows asked for advance
+    assert array.randint(1, 2, [1]).tolist() == [streams[1].randint(1, 2)]
+    assert array.counters.tolist() == [s.counter for s in streams]
+
+
+def test_streams_are_independent():
+    first = SessionRandom(3)
+    second = SessionRandom(3)
+    for _ in range(50):
+        first.lanes.next()
+    assert [first.events.randint(0, 100) for _ in range(20)] == \
+        [second.events.randint(0, 100) for _ in range(20)]
+    assert SessionRandom(3).lanes.next() != SessionRandom(3).events.next()
+
+
+@pytest.mark.parametrize(["a", "b"], [(0, 100), (1, 2), (-39, 39)])
+def test_randint_bounds(a, b):
+    stream = Stream(1, "events")
+    draws = [stream.randint(a, b) for _ in range(2000)]
+    assert min(draws) == a and max(draws) == b
+
+
+def test_state_round_trip():
+    random = SessionRandom(9)
+    random.lanes.next()
+    state = random.getstate()
+    expected = (random.lanes.next(), random.events.next())
+    random.setstate(state)
+    assert (random.lanes.next(), random.events.next()) == expected
+
+
+def test_seed_is_kept():
+    assert SessionRandom(11).seed == 11
+    assert isinstance(SessionRandom().seed, int)
+    with pytest.raises(IndexError):
+        Stream(0, "lanes").choice([])
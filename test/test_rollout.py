@@ -0,0 +1,50 @@
+import pytest
+from game import rollout
+
+
+def strip_timing(summary):
+    stripped = {k: v for k, v in summary.items()
+                if k not in ("seconds", "ticks_per_second")}
+    if "policy" in stripped:
+        stripped["policy"] = {k: v for k, v in stripped["policy"].items()
+                              if k != "seconds" and
+                              not k.endswith("_per_second")}
+    return stripped
+
+
+def test_episode_seeds_are_deterministic():
+    assert rollout.episodeSeeds(5, 4) == rollout.episodeSeeds(5, 4)
+    assert rollout.episodeSeeds(5, 4) != rollout.episodeSeeds(6, 4)
+
+
+@pytest.mark.parametrize(["count", "sizes"], [
+    (1, [10]),
+    (3, [4, 4, 2]),
+    (20, [1] * 10),
+])
+def test_shards(count, sizes):
+    parts = rollout.shards(list(range(10)), count)
+    assert [len(part) for part in parts] == sizes
+    assert sum(parts, []) == list(range(10))
+
+
+def test_summarize_merges_results():
+    results = [
+        {"points": 10, "level": 1, "ticks": 100,
+         "deaths": {"car": 2, "water": 1, "time": 0}},
+        {"points": 30, "level": 2, "ticks": 50,
+         "deaths": {"car": 0, "water": 2, "time": 1}},
+    ]
+    summary = rollout.summarize(results, 1.0)
+    assert summary["episodes"] == 2
+    assert summary["points"] == {"mean": 20, "min": 10, "max": 30}
+    assert summary["levels"] == {"1": 1, "2": 1}
+    assert summary["deaths"] == {"car": 2, "water": 3, "time": 1}
+    assert summary["ticks_per_second"] == 150
+
+
+@pytest.mark.parametrize("policy", ["random", "scripted", "search"])
+def test_workers_do_not_change_results(policy):
+    single = rollout.rollout(4, 1, policy, seed=2, max_ticks=600)
+    pooled = rollout.rollout(4, 2, policy, seed=2, max_ticks=600)
+    assert strip_timing(single) == strip_timing(pooled)
@@ -0,0 +1,43 @@
+import pytest
+from game import frogger
+
+
+def test_sessions_are_independent():
+    first = frogger.Session()
+    second = frogger.Session()
+    for i in range(60):
+        first.update()
+    assert first.enemys is not second.enemys
+    assert first.game is not second.game
+    assert len(first.enemys) > 0
+    assert second.enemys == []
+    assert second.tick == 0
+
+
+def test_session_does_not_touch_module_state():
+    session = frogger.Session()
+    for i in range(60):
+        session.update()
+    assert frogger.enemys == []
+    assert frogger.plataforms == []
+
+
+@pytest.mark.parametrize(["key", "expected_pos"], [
+    ("up", [207, 462]),
+    ("down", [207, 475]),
+    ("right", [221, 475]),
+])
+def test_press_key(key, expected_pos):
+    session = frogger.Session()
+    session.pressKey(key)
+    assert session.frog.position == expected_pos
+    assert session.frog.can_move == 0
+
+
+def test_new_frog_keeps_game():
+    session = frogger.Session()
+    session.game.incPoints(50)
+    session.frog.lives = 0
+    session.newFrog()
+    assert session.frog.lives == 3
+    assert session.game.points == 50
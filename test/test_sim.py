@@ -0,0 +1,49 @@
+import pytest
+from game.sim import FroggerSim
+
+
+def test_reset_state():
+    sim = FroggerSim(0)
+    state = sim.state()
+    assert state["tick"] == 0
+    assert state["frog"] == (207, 475)
+    assert state["lives"] == 3
+    assert state["enemys"] == []
+    assert state["plataforms"] == []
+
+
+def test_first_tick_spawns():
+    sim = FroggerSim(0)
+    reward, done = sim.step()
+    state = sim.state()
+    assert (reward, done) == (0, False)
+    assert len(state["enemys"]) == 2
+    assert len(state["plataforms"]) == 2
+
+
+@pytest.mark.parametrize(["action", "expected_pos"], [
+    ("up", (207, 462)),
+    (1, (207, 462)),
+    ("left", (193, 475)),
+    (None, (207, 475)),
+])
+def test_step_moves_frog(action, expected_pos):
+    sim = FroggerSim(0)
+    sim.step(action)
+    assert sim.state()["frog"] == expected_pos
+
+
+def test_idle_frog_dies_of_timeout():
+    sim = FroggerSim(0)
+    ticks = sim.run(10000)
+    assert sim.state()["lives"] == 0
+    assert ticks < 10000
+
+
+@pytest.mark.parametrize("seed", [0, 7, 42])
+def test_same_seed_same_game(seed):
+    sims = [FroggerSim(seed), FroggerSim(seed)]
+    for sim in sims:
+        for i in range(500):
+            sim.step(("up", None, "left", None, "right")[i % 5])
+    assert sims[0].state() == sims[1].state()
@@ -0,0 +1,65 @@
+import pytest
+from game import frogger
+from game.spawner import SpawnScheduler
+
+
+def spawn_both(lanes, cls, create, levels, ticks=3000):
+    # the heap scheduler against the per-tick counters of createEnemys
+    game = frogger.Game(3, 1)
+    scheduler = SpawnScheduler(lanes, cls)
+    counters = [lane[2] for lane in lanes]
+    scheduled = []
+    counted = []
+    for tick in range(ticks):
+        if tick in levels:
+            game.speed, game.level = levels[tick]
+        scheduler.update(scheduled, game)
+        create(counters, counted, game)
+        assert [e.position for e in scheduled] == \
+            [e.position for e in counted]
+        assert scheduler.getCounters() == pytest.approx(counters)
+    return scheduled
+
+
+@pytest.mark.parametrize("levels", [{}, {500: (4, 2), 1200: (5, 3)},
+                                    {0: (9, 7), 900: (0, 1)}])
+def test_cars_match_counters(levels):
+    cars = spawn_both(frogger.CAR_LANES, frogger.Enemy, frogger.createEnemys,
+                      levels)
+    assert len(cars) > 100
+
+
+@pytest.mark.parametrize("levels", [{}, {700: (6, 4)}])
+def test_logs_match_counters(levels):
+    spawn_both(frogger.LOG_LANES, frogger.Plataform, frogger.createPlataform,
+               levels)
+
+
+def test_counters_round_trip():
+    game = frogger.Game(5, 3)
+    scheduler = SpawnScheduler(frogger.CAR_LANES, frogger.Enemy)
+    cars = []
+    for tick in range(77):
+        scheduler.update(cars, game)
+    copy = SpawnScheduler(frogger.CAR_LANES, frogger.Enemy)
+    copy.setCounters(scheduler.getCounters())
+    restored = []
+    cars = []
+    for tick in range(500):
+        scheduler.update(cars, game)
+        copy.update(restored, game)
+        assert [e.position for e in restored] == [e.position for e in cars]
+    assert cars
+
+
+def test_custom_layout_and_formula():
+    lanes = tuple((0, 100 + 10 * i, i, 5, frogger.sprite_plataform, "right")
+                  for i in range(50))
+    scheduler = SpawnScheduler(lanes, frogger.Plataform,
+                               lambda interval, game: interval)
+    logs = []
+    for tick in range(10):
+        scheduler.update(logs, None)
+    # lane i spawns at tick i and again 6 ticks later
+    assert [log.position[1] for log in logs] == \
+        [100, 110, 120, 130, 140, 150, 100, 160, 110, 170, 120, 180, 130, 190]
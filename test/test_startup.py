@@ -0,0 +1,62 @@
+import pytest
+from game import frogger
+
+
+def test_import_time_is_recorded():
+    assert frogger.startupReport()["import"] > 0
+
+
+@pytest.mark.parametrize("name", ["hit_sound", "agua_sound", "chegou_sound",
+                                  "trilha_sound"])
+def test_sounds_are_loaded_in_background(name):
+    assert frogger.sound_loader.wait(5)
+    assert "audio" in frogger.startup
+    assert not isinstance(getattr(frogger, name), frogger.SilentSound)
+
+
+def test_fonts_render_without_system_scan():
+    assert frogger.menu_font.get_height() > frogger.info_font.get_height()
+    assert frogger.game_font.get_height() > frogger.menu_font.get_height()
+
+
+def test_loader_keeps_sounds_replaced_meanwhile(monkeypatch):
+    mine = frogger.SilentSound()
+    monkeypatch.setattr(frogger, "hit_sound", mine)
+    monkeypatch.setattr(frogger, "agua_sound", None)
+    loader = frogger.SoundLoader((("hit_sound", "./sounds/boom.wav"),
+                                  ("agua_sound", "./sounds/agua.wav")))
+    assert loader.wait(5)
+    assert frogger.hit_sound is mine
+    assert frogger.agua_sound is None
+
+
+class Loading():
+
+    def __init__(self):
+        self.done = False
+
+    def ready(self):
+        return self.done
+
+
+class Track():
+
+    def __init__(self):
+        self.plays = []
+
+    def play(self, loops=0):
+        self.plays.append(loops)
+
+
+def test_music_starts_once_the_sounds_are_in(monkeypatch):
+    loader = Loading()
+    track = Track()
+    monkeypatch.setattr(frogger, "sound_loader", loader)
+    monkeypatch.setattr(frogger, "trilha_sound", track)
+    # the menu keeps drawing while the mixer comes up
+    assert frogger.startMusic(False) is False
+    assert track.plays == []
+    loader.done = True
+    assert frogger.startMusic(False) is True
+    assert frogger.startMusic(True) is True
+    assert track.plays == [-1]